@@ -6,7 +6,7 @@ from discord.ext import commands
 from pie import check, i18n, logger, utils
 
 import pie.acl
-from pie.acl.database import ACDefault, ACLevel, ACLevelMappping
+from pie.acl.database import ACDefault, ACLevel, ACLevelMappping, ACLevelMappingView
 from pie.acl.database import UserOverwrite, ChannelOverwrite, RoleOverwrite
 
 _ = i18n.Translator("modules/base").translate
@@ -41,18 +41,18 @@ class ACL(commands.Cog):
         """Display ACL level to role mappings."""
 
         class Item:
-            def __init__(self, mapping: ACLevelMappping):
-                self.level = mapping.level.name
+            def __init__(self, mapping: ACLevelMappingView):
+                self.level = ACLevel(mapping.level).name
                 role = ctx.guild.get_role(mapping.role_id)
                 self.role = getattr(role, "name", str(mapping.role_id))
 
-        mappings = ACLevelMappping.get_all(ctx.guild.id)
+        mappings = ACLevelMappping.get_all_rows(ctx.guild.id)
 
         if not mappings:
             await ctx.reply(_(ctx, "No mappings have been set."))
             return
 
-        mappings = sorted(mappings, key=lambda m: m.level.name)[::-1]
+        mappings = sorted(mappings, key=lambda m: ACLevel(m.level).name)[::-1]
         items = [Item(mapping) for mapping in mappings]
 
         table: list[str] = utils.text.create_table(
@@ -118,7 +118,7 @@ class ACL(commands.Cog):
         if mapped.level >= pie.acl.map_member_to_ACLevel(bot=self.bot, member=ctx.author):
             await ctx.reply(
                 _(ctx, "Your ACLevel has to be higher than **{level}**.").format(
-                    level=mapped.level.name
+                    level=ACLevel(mapped.level).name
                 )
             )
             return
@@ -146,7 +146,7 @@ class ACL(commands.Cog):
         class Item:
             def __init__(self, bot: commands.Bot, default: ACDefault):
                 self.command = default.command
-                self.level = default.level.name
+                self.level = ACLevel(default.level).name
                 command_fn = bot.get_command(self.command).callback
                 level = pie.acl.get_hardcoded_ACLevel(command_fn)
                 self.default: str = getattr(level, "name", "?")
@@ -277,7 +277,7 @@ class ACL(commands.Cog):
         bot_commands = sorted(bot_commands, key=lambda c: c.qualified_name)
 
         default_overwrites = {}
-        for default_overwrite in ACDefault.get_all(ctx.guild.id):
+        for default_overwrite in ACDefault.get_all_rows(ctx.guild.id):
             default_overwrites[default_overwrite.command] = default_overwrite.level
 
         class Item:
@@ -287,7 +287,7 @@ class ACL(commands.Cog):
                 level = pie.acl.get_hardcoded_ACLevel(command_fn)
                 self.level: str = getattr(level, "name", "?")
                 try:
-                    self.db_level = default_overwrites[self.command].name
+                    self.db_level = ACLevel(default_overwrites[self.command]).name
                 except KeyError:
                     self.db_level = ""
 
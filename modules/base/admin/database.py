@@ -5,10 +5,10 @@ from typing import cast
 from sqlalchemy import select
 from sqlalchemy.orm import Mapped, mapped_column
 
-from pie.database import session, Base
+from pie.database import session, Base, BulkAddMixin, commit_or_defer, dialect_insert
 
 
-class BaseAdminModule(Base):
+class BaseAdminModule(BulkAddMixin, Base):
     __tablename__ = "base_admin_modules"
 
     name: Mapped[str] = mapped_column(primary_key=True)
@@ -16,18 +16,25 @@ class BaseAdminModule(Base):
 
     @staticmethod
     def add(name: str, enabled: bool) -> BaseAdminModule:
-        """Add new module entry to database."""
-        module = BaseAdminModule(name=name, enabled=enabled)
-        session.merge(module)
-        session.commit()
+        """Add new module entry to database.
+
+        If the entry already exists, it is updated.
+        """
+        stmt = dialect_insert(BaseAdminModule).values(name=name, enabled=enabled)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"], set_={"enabled": stmt.excluded.enabled}
+        )
+        module = session.scalars(
+            stmt.returning(BaseAdminModule),
+            execution_options={"populate_existing": True},
+        ).one()
+        commit_or_defer()
         return module
 
     @staticmethod
     def get(name: str) -> BaseAdminModule | None:
         """Get module entry."""
-        return session.execute(
-            select(BaseAdminModule).where(BaseAdminModule.name == name)
-        ).scalar_one_or_none()
+        return session.get(BaseAdminModule, name)
 
     @staticmethod
     def get_all() -> list[BaseAdminModule]:
@@ -184,7 +184,7 @@ class Admin(commands.Cog):
             return
 
         # check if the repo isn't already installed
-        if repository.name in [r.name for r in manager.repositories]:
+        if manager.get_repository(repository.name) is not None:
             tempdir.cleanup()
             await ctx.send(
                 _(ctx, "Repository named `{name}` already exists.").format(
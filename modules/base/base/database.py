@@ -1,14 +1,106 @@
 from __future__ import annotations
 
-from typing import cast
-
-from sqlalchemy import BigInteger, select, delete, CursorResult
+from collections.abc import Sequence
+from typing import Any, cast
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    UniqueConstraint,
+    and_,
+    or_,
+    select,
+    delete,
+    insert,
+    tuple_,
+    CursorResult,
+    Row,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
-from pie.database import session, Base
-
-
-class UserPin(Base):
+from pie.database import session, Base, BulkAddMixin, commit_or_defer, dialect_insert
+
+
+def _match_channel(model: Any, channel_id: int | None) -> Any:
+    """Build clause matching the channel, with explicit ``IS NULL`` for ``None``."""
+    if channel_id is None:
+        return model.channel_id.is_(None)
+    return model.channel_id == channel_id
+
+
+def _upsert(
+    model: Any,
+    guild_id: int,
+    channel_id: int | None,
+    *,
+    commit: bool = True,
+    **values,
+) -> Any:
+    """Insert or update channel preference.
+
+    When the ``channel_id`` is set, only one ``INSERT ... ON CONFLICT DO UPDATE``
+    statement is issued. Guild-wide preferences have ``channel_id`` of ``None``,
+    and because NULL values never conflict in unique constraints, the old
+    preference has to be deleted first.
+    """
+    if channel_id is None:
+        session.execute(
+            delete(model).where(model.guild_id == guild_id, model.channel_id.is_(None))
+        )
+        stmt = insert(model).values(guild_id=guild_id, channel_id=None, **values)
+    else:
+        stmt = dialect_insert(model).values(
+            guild_id=guild_id, channel_id=channel_id, **values
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["guild_id", "channel_id"],
+            set_={key: stmt.excluded[key] for key in values},
+        )
+    result = session.scalars(
+        stmt.returning(model), execution_options={"populate_existing": True}
+    ).one()
+    commit_or_defer(commit)
+    return result
+
+
+def _remove_many(
+    model: Any, pairs: Sequence[tuple[int, int | None]], commit: bool
+) -> int:
+    """Remove channel preferences with one statement.
+
+    :param pairs: Pairs of guild ID and channel ID.
+
+    NULL values never match in ``IN`` clause, so guild-wide preferences are
+    matched separately.
+    """
+    guild_ids: list[int] = [
+        guild_id for guild_id, channel_id in pairs if channel_id is None
+    ]
+    channels: list[tuple[int, int | None]] = [
+        pair for pair in pairs if pair[1] is not None
+    ]
+
+    clauses: list[ColumnElement[bool]] = []
+    if channels:
+        clauses.append(tuple_(model.guild_id, model.channel_id).in_(channels))
+    if guild_ids:
+        clauses.append(and_(model.guild_id.in_(guild_ids), model.channel_id.is_(None)))
+    if not clauses:
+        return 0
+
+    result = session.execute(delete(model).where(or_(*clauses)))
+    commit_or_defer(commit)
+    return cast(CursorResult, result).rowcount
+
+
+def _remove_by_guild(model: Any, guild_id: int, commit: bool) -> int:
+    """Remove all channel preferences of the guild."""
+    result = session.execute(delete(model).where(model.guild_id == guild_id))
+    commit_or_defer(commit)
+    return cast(CursorResult, result).rowcount
+
+
+class UserPin(BulkAddMixin, Base):
     __tablename__ = "base_base_userpin"
 
     idx: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -16,23 +108,20 @@ class UserPin(Base):
     channel_id: Mapped[int | None] = mapped_column(BigInteger, default=None)
     limit: Mapped[int] = mapped_column(default=0)
 
+    __table_args__ = (UniqueConstraint(guild_id, channel_id),)
+
     @staticmethod
     def add(guild_id: int, channel_id: int | None, limit: int = 0) -> UserPin:
         """Add userpin preference."""
-        if UserPin.get(guild_id, channel_id) is not None:
-            UserPin.remove(guild_id, channel_id)
-        query = UserPin(guild_id=guild_id, channel_id=channel_id, limit=limit)
-        session.add(query)
-        session.commit()
-        return query
+        return _upsert(UserPin, guild_id, channel_id, limit=limit)
 
     @staticmethod
     def get(guild_id: int, channel_id: int | None) -> UserPin | None:
         """Get userpin preferences for the guild."""
         user_pin = session.execute(
-            select(UserPin)
-            .where(UserPin.guild_id == guild_id)
-            .where(UserPin.channel_id == channel_id)
+            select(UserPin).where(
+                UserPin.guild_id == guild_id, _match_channel(UserPin, channel_id)
+            )
         ).scalar_one_or_none()
         return user_pin
 
@@ -46,16 +135,36 @@ class UserPin(Base):
 
         return cast(list[UserPin], user_pins)
 
+    @staticmethod
+    def get_all_rows(guild_id: int) -> list[Row]:
+        """Get preferences of the guild as rows of ``guild_id``, ``channel_id``, ``limit``."""
+        rows = session.execute(
+            select(UserPin.guild_id, UserPin.channel_id, UserPin.limit).where(
+                UserPin.guild_id == guild_id
+            )
+        ).all()
+        return cast(list[Row], rows)
+
     @staticmethod
     def remove(guild_id: int, channel_id: int | None) -> int:
         result = session.execute(
-            delete(UserPin)
-            .where(UserPin.guild_id == guild_id)
-            .where(UserPin.channel_id == channel_id)
+            delete(UserPin).where(
+                UserPin.guild_id == guild_id, _match_channel(UserPin, channel_id)
+            )
         )
-        session.commit()
+        commit_or_defer()
         return cast(CursorResult, result).rowcount
 
+    @staticmethod
+    def remove_many(pairs: list[tuple[int, int | None]], *, commit: bool = True) -> int:
+        """Remove preferences by pairs of guild ID and channel ID."""
+        return _remove_many(UserPin, pairs, commit)
+
+    @staticmethod
+    def remove_by_guild(guild_id: int, *, commit: bool = True) -> int:
+        """Remove all preferences of the guild."""
+        return _remove_by_guild(UserPin, guild_id, commit)
+
     def __repr__(self) -> str:
         return (
             f"<UserPin idx='{self.idx}' guild_id='{self.guild_id}' "
@@ -70,7 +179,7 @@ class UserPin(Base):
         }
 
 
-class UserThread(Base):
+class UserThread(BulkAddMixin, Base):
     __tablename__ = "base_base_userthread"
 
     idx: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -78,23 +187,20 @@ class UserThread(Base):
     channel_id: Mapped[int | None] = mapped_column(BigInteger, default=None)
     limit: Mapped[int] = mapped_column(default=0)
 
+    __table_args__ = (UniqueConstraint(guild_id, channel_id),)
+
     @staticmethod
     def add(guild_id: int, channel_id: int | None, limit: int = 0) -> UserThread:
         """Add userthread preference."""
-        if UserThread.get(guild_id, channel_id) is not None:
-            UserThread.remove(guild_id, channel_id)
-        user_thread = UserThread(guild_id=guild_id, channel_id=channel_id, limit=limit)
-        session.add(user_thread)
-        session.commit()
-        return user_thread
+        return _upsert(UserThread, guild_id, channel_id, limit=limit)
 
     @staticmethod
     def get(guild_id: int, channel_id: int | None) -> UserThread | None:
         """Get userthread preference for the guild."""
         result = session.execute(
-            select(UserThread)
-            .where(UserThread.guild_id == guild_id)
-            .where(UserThread.channel_id == channel_id)
+            select(UserThread).where(
+                UserThread.guild_id == guild_id, _match_channel(UserThread, channel_id)
+            )
         ).scalar_one_or_none()
         return result
 
@@ -107,16 +213,36 @@ class UserThread(Base):
         )
         return cast(list[UserThread], user_threads)
 
+    @staticmethod
+    def get_all_rows(guild_id: int) -> list[Row]:
+        """Get preferences of the guild as rows of ``guild_id``, ``channel_id``, ``limit``."""
+        rows = session.execute(
+            select(UserThread.guild_id, UserThread.channel_id, UserThread.limit).where(
+                UserThread.guild_id == guild_id
+            )
+        ).all()
+        return cast(list[Row], rows)
+
     @staticmethod
     def remove(guild_id: int, channel_id: int | None) -> int:
         result = session.execute(
-            delete(UserThread)
-            .where(UserThread.guild_id == guild_id)
-            .where(UserThread.channel_id == channel_id)
+            delete(UserThread).where(
+                UserThread.guild_id == guild_id, _match_channel(UserThread, channel_id)
+            )
         )
-        session.commit()
+        commit_or_defer()
         return cast(CursorResult, result).rowcount
 
+    @staticmethod
+    def remove_many(pairs: list[tuple[int, int | None]], *, commit: bool = True) -> int:
+        """Remove preferences by pairs of guild ID and channel ID."""
+        return _remove_many(UserThread, pairs, commit)
+
+    @staticmethod
+    def remove_by_guild(guild_id: int, *, commit: bool = True) -> int:
+        """Remove all preferences of the guild."""
+        return _remove_by_guild(UserThread, guild_id, commit)
+
     def __repr__(self) -> str:
         return (
             f"<UserThread idx='{self.idx}' guild_id='{self.guild_id}' "
@@ -131,7 +257,7 @@ class UserThread(Base):
         }
 
 
-class Bookmark(Base):
+class Bookmark(BulkAddMixin, Base):
     __tablename__ = "base_base_bookmarks"
 
     idx: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -139,21 +265,18 @@ class Bookmark(Base):
     channel_id: Mapped[int | None] = mapped_column(BigInteger, default=None)
     enabled: Mapped[bool] = mapped_column(default=False)
 
+    __table_args__ = (UniqueConstraint(guild_id, channel_id),)
+
     @staticmethod
     def add(guild_id: int, channel_id: int | None, enabled: bool = False) -> Bookmark:
-        if Bookmark.get(guild_id, channel_id) is not None:
-            Bookmark.remove(guild_id, channel_id)
-        query = Bookmark(guild_id=guild_id, channel_id=channel_id, enabled=enabled)
-        session.add(query)
-        session.commit()
-        return query
+        return _upsert(Bookmark, guild_id, channel_id, enabled=enabled)
 
     @staticmethod
     def get(guild_id: int, channel_id: int | None) -> Bookmark | None:
         result = session.execute(
-            select(Bookmark)
-            .where(Bookmark.guild_id == guild_id)
-            .where(Bookmark.channel_id == channel_id)
+            select(Bookmark).where(
+                Bookmark.guild_id == guild_id, _match_channel(Bookmark, channel_id)
+            )
         ).scalar_one_or_none()
         return result
 
@@ -166,16 +289,36 @@ class Bookmark(Base):
         )
         return cast(list[Bookmark], result)
 
+    @staticmethod
+    def get_all_rows(guild_id: int) -> list[Row]:
+        """Get preferences of the guild as rows of ``guild_id``, ``channel_id``, ``enabled``."""
+        rows = session.execute(
+            select(Bookmark.guild_id, Bookmark.channel_id, Bookmark.enabled).where(
+                Bookmark.guild_id == guild_id
+            )
+        ).all()
+        return cast(list[Row], rows)
+
     @staticmethod
     def remove(guild_id: int, channel_id: int | None) -> int:
         result = session.execute(
-            delete(Bookmark)
-            .where(Bookmark.guild_id == guild_id)
-            .where(Bookmark.channel_id == channel_id)
+            delete(Bookmark).where(
+                Bookmark.guild_id == guild_id, _match_channel(Bookmark, channel_id)
+            )
         )
-        session.commit()
+        commit_or_defer()
         return cast(CursorResult, result).rowcount
 
+    @staticmethod
+    def remove_many(pairs: list[tuple[int, int | None]], *, commit: bool = True) -> int:
+        """Remove preferences by pairs of guild ID and channel ID."""
+        return _remove_many(Bookmark, pairs, commit)
+
+    @staticmethod
+    def remove_by_guild(guild_id: int, *, commit: bool = True) -> int:
+        """Remove all preferences of the guild."""
+        return _remove_by_guild(Bookmark, guild_id, commit)
+
     def __repr__(self) -> str:
         return (
             f"<Bookmark idx='{self.idx}' guild_id='{self.guild_id}' "
@@ -190,7 +333,7 @@ class Bookmark(Base):
         }
 
 
-class AutoThread(Base):
+class AutoThread(BulkAddMixin, Base):
     __tablename__ = "base_base_autothread"
 
     idx: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -198,25 +341,20 @@ class AutoThread(Base):
     channel_id: Mapped[int] = mapped_column(BigInteger)
     duration: Mapped[int] = mapped_column()
 
+    __table_args__ = (UniqueConstraint(guild_id, channel_id),)
+
     @staticmethod
-    def add(guild_id: int, channel_id: int, duration: int) -> AutoThread:
-        query = AutoThread.get(guild_id, channel_id)
-        if query:
-            query.duration = duration
-        else:
-            query = AutoThread(
-                guild_id=guild_id, channel_id=channel_id, duration=duration
-            )
-        session.add(query)
-        session.commit()
-        return query
+    def add(
+        guild_id: int, channel_id: int, duration: int, *, commit: bool = True
+    ) -> AutoThread:
+        return _upsert(AutoThread, guild_id, channel_id, commit=commit, duration=duration)
 
     @staticmethod
     def get(guild_id: int, channel_id: int) -> AutoThread | None:
         result = session.execute(
-            select(AutoThread)
-            .where(AutoThread.guild_id == guild_id)
-            .where(AutoThread.channel_id == channel_id)
+            select(AutoThread).where(
+                AutoThread.guild_id == guild_id, AutoThread.channel_id == channel_id
+            )
         ).scalar_one_or_none()
         return result
 
@@ -230,15 +368,35 @@ class AutoThread(Base):
         return cast(list[AutoThread], result)
 
     @staticmethod
-    def remove(guild_id: int, channel_id: int) -> int:
+    def get_all_rows(guild_id: int) -> list[Row]:
+        """Get preferences of the guild as rows of ``guild_id``, ``channel_id``, ``duration``."""
+        rows = session.execute(
+            select(AutoThread.guild_id, AutoThread.channel_id, AutoThread.duration).where(
+                AutoThread.guild_id == guild_id
+            )
+        ).all()
+        return cast(list[Row], rows)
+
+    @staticmethod
+    def remove(guild_id: int, channel_id: int, *, commit: bool = True) -> int:
         result = session.execute(
-            delete(AutoThread)
-            .where(AutoThread.guild_id == guild_id)
-            .where(AutoThread.channel_id == channel_id)
+            delete(AutoThread).where(
+                AutoThread.guild_id == guild_id, AutoThread.channel_id == channel_id
+            )
         )
-        session.commit()
+        commit_or_defer(commit)
         return cast(CursorResult, result).rowcount
 
+    @staticmethod
+    def remove_many(pairs: list[tuple[int, int]], *, commit: bool = True) -> int:
+        """Remove preferences by pairs of guild ID and channel ID."""
+        return _remove_many(AutoThread, pairs, commit)
+
+    @staticmethod
+    def remove_by_guild(guild_id: int, *, commit: bool = True) -> int:
+        """Remove all preferences of the guild."""
+        return _remove_by_guild(AutoThread, guild_id, commit)
+
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__name__} "
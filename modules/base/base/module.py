@@ -2,6 +2,7 @@ from math import ceil
 
 import discord
 from discord.ext import commands, tasks
+from sqlalchemy import Row
 
 from pie import check, i18n, logger, utils
 
@@ -48,7 +49,7 @@ class Base(commands.Cog):
     @userpin_.command(name="list")
     async def userpin_list(self, ctx):
         """List pin limits on this server."""
-        db_channels = UserPin.get_all(ctx.guild.id)
+        db_channels = UserPin.get_all_rows(ctx.guild.id)
         if not db_channels:
             await ctx.reply(_(ctx, "User pinning is not enabled on this server."))
             return
@@ -141,7 +142,7 @@ class Base(commands.Cog):
     @bookmarks_.command(name="list")
     async def bookmarks_list(self, ctx):
         """List channels where bookmarks are enabled and disabled."""
-        db_channels = Bookmark.get_all(ctx.guild.id)
+        db_channels = Bookmark.get_all_rows(ctx.guild.id)
         if not db_channels:
             await ctx.reply(_(ctx, "Bookmarks are not enabled on this server."))
             return
@@ -214,7 +215,7 @@ class Base(commands.Cog):
     @userthread_.command(name="list")
     async def userthread_list(self, ctx):
         """List channels where user threads are enabled."""
-        db_channels = UserThread.get_all(ctx.guild.id)
+        db_channels = UserThread.get_all_rows(ctx.guild.id)
         if not db_channels:
             await ctx.reply(_(ctx, "User threads are not enabled on this server."))
             return
@@ -309,9 +310,10 @@ class Base(commands.Cog):
     @autothread_.command(name="list")
     async def autothread_list(self, ctx):
         """List channels where threads are created automatically."""
-        channels: list[tuple[discord.TextChannel, AutoThread]] = []
+        channels: list[tuple[discord.TextChannel, Row]] = []
+        missing: list[tuple[int, int]] = []
 
-        for item in AutoThread.get_all(ctx.guild.id):
+        for item in AutoThread.get_all_rows(ctx.guild.id):
             channel = ctx.guild.get_channel(item.channel_id)
             if channel is None:
                 await guild_log.info(
@@ -319,9 +321,10 @@ class Base(commands.Cog):
                     ctx.channel,
                     f"Autothread channel {item.channel_id} not found, deleting.",
                 )
-                AutoThread.remove(item.guild_id, item.channel_id)
+                missing.append((item.guild_id, item.channel_id))
                 continue
             channels.append((channel, item))
+        AutoThread.remove_many(missing)
 
         if not len(channels):
             await ctx.reply(_(ctx, "No channel has autothread enabled."))
@@ -5,7 +5,7 @@ import datetime
 from sqlalchemy import BigInteger, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
-from pie.database import session, Base
+from pie.database import session, Base, commit_or_defer
 
 
 class Subscription(Base):
@@ -23,7 +23,7 @@ class Subscription(Base):
             return None
         query = cls(guild_id=guild_id, channel_id=channel_id)
         session.add(query)
-        session.commit()
+        commit_or_defer()
         return query
 
     @classmethod
@@ -84,7 +84,7 @@ class LastError(Base):
             query = cls()
             session.add(query)
         query.date = today
-        session.commit()
+        commit_or_defer()
         return True
 
     @classmethod
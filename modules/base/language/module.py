@@ -80,8 +80,6 @@ class Language(commands.Cog):
             _(ctx, "I'll remember the preference of **{language}**.").format(
                 language=language,
             )
-            + " "
-            + _(ctx, "You may need to wait two minutes for the change to take effect.")
         )
 
     @check.acl2(check.ACLevel.MEMBER)
@@ -96,9 +94,7 @@ class Language(commands.Cog):
             await ctx.reply(_(ctx, "You don't have any language preference."))
             return
         await guild_log.debug(ctx.author, ctx.channel, "Language preference unset.")
-        await ctx.reply(
-            _(ctx, "You may need to wait two minutes for the change to take effect.")
-        )
+        await ctx.reply(_(ctx, "Your language preference has been removed."))
 
     @check.acl2(check.ACLevel.MOD)
     @language_.group(name="server", aliases=["guild"])
@@ -123,8 +119,6 @@ class Language(commands.Cog):
             _(ctx, "I'll be using **{language}** on this server now.").format(
                 language=language,
             )
-            + " "
-            + _(ctx, "You may need to wait two minutes for the change to take effect.")
         )
 
     @check.acl2(check.ACLevel.MOD)
@@ -136,11 +130,7 @@ class Language(commands.Cog):
             await ctx.reply(_(ctx, "This server doesn't have any language preference."))
             return
         await guild_log.info(ctx.author, ctx.channel, "Guild language preference unset.")
-        await ctx.reply(
-            _(ctx, "I'll be using the global settings from now on.")
-            + " "
-            + _(ctx, "You may need to wait two minutes for the change to take effect.")
-        )
+        await ctx.reply(_(ctx, "I'll be using the global settings from now on."))
 
     @check.acl2(check.ACLevel.MOD)
     @language_.command(name="audit")
@@ -13,7 +13,8 @@ from discord.ext import commands
 import pie._tracing
 from pie import i18n
 
-from pie.acl.database import ACDefault, ACLevel, ACLevelMappping
+from pie.acl.database import ACLevel
+from pie.acl.snapshot import ACLSnapshot
 from pie.exceptions import (
     ACLFailure,
     NegativeUserOverwrite,
@@ -21,7 +22,6 @@ from pie.exceptions import (
     NegativeRoleOverwrite,
     InsufficientACLevel,
 )
-from pie.acl.database import UserOverwrite, ChannelOverwrite, RoleOverwrite
 
 _trace: Callable = pie._tracing.register("pie_acl")
 
@@ -64,13 +64,14 @@ def map_member_to_ACLevel(
         member_level = ACLevel.GUILD_OWNER
     else:
         member_level = ACLevel.EVERYONE
+        level_map = ACLSnapshot.load(member.guild.id).level_map
         for role in member.roles[::-1]:
-            mapping = ACLevelMappping.get(member.guild.id, role.id)
-            if mapping is not None:
+            mapped_level = level_map.get(role.id)
+            if mapped_level is not None:
                 _acl_trace(
-                    f"'{member}' is mapped via '{role.name}' to '{mapping.level.name}'."
+                    f"'{member}' is mapped via '{role.name}' to '{mapped_level.name}'."
                 )
-                member_level = mapping.level
+                member_level = mapped_level
                 break
 
     return member_level
@@ -163,31 +164,33 @@ def acl2_function(
         _acl_trace("Bot owner is always allowed.")
         return True
 
-    custom_level = ACDefault.get(guild.id, command)
-    if custom_level:
-        level = custom_level.level
+    snapshot = ACLSnapshot.load(guild.id)
+
+    custom_level = snapshot.defaults.get(command)
+    if custom_level is not None:
+        level = custom_level
 
     _acl_trace(f"Required level '{level.name}'.")
 
-    uo = UserOverwrite.get(guild.id, invoker.id, command)
+    uo = snapshot.user_over.get((invoker.id, command))
     if uo is not None:
-        _acl_trace(f"User overwrite for '{invoker}' exists: '{uo.allow}'.")
-        if uo.allow:
+        _acl_trace(f"User overwrite for '{invoker}' exists: '{uo}'.")
+        if uo:
             return True
         raise NegativeUserOverwrite()
 
-    co = ChannelOverwrite.get(guild.id, channel.id, command)
+    co = snapshot.channel_over.get((channel.id, command))
     if co is not None:
-        _acl_trace(f"Channel overwrite for '#{channel.name}' exists: '{co.allow}'.")
-        if co.allow:
+        _acl_trace(f"Channel overwrite for '#{channel.name}' exists: '{co}'.")
+        if co:
             return True
         raise NegativeChannelOverwrite(channel=channel)
 
     for role in invoker.roles:
-        ro = RoleOverwrite.get(guild.id, role.id, command)
+        ro = snapshot.role_over.get((role.id, command))
         if ro is not None:
-            _acl_trace(f"Role overwrite for '{role.name}' exists: '{ro.allow}'.")
-            if ro.allow:
+            _acl_trace(f"Role overwrite for '{role.name}' exists: '{ro}'.")
+            if ro:
                 return True
             raise NegativeRoleOverwrite(role=role)
 
@@ -218,11 +221,8 @@ def get_hardcoded_ACLevel(command: Callable) -> ACLevel | None:
 
 def get_true_ACLevel(bot: commands.Bot, guild_id: int, command: str) -> ACLevel | None:
     """Get command's ACLevel from database or from the source code."""
-    default_overwrite = ACDefault.get(guild_id, command)
-    level: ACLevel | None
-    if default_overwrite:
-        level = default_overwrite.level
-    else:
+    level: ACLevel | None = ACLSnapshot.load(guild_id).defaults.get(command)
+    if level is None:
         command_obj = bot.get_command(command)
         level = get_hardcoded_ACLevel(command_obj.callback)
     return level
@@ -1,12 +1,45 @@
 from __future__ import annotations
 
 import enum
-from typing import Any
-
-from sqlalchemy import BigInteger, Boolean, Column, Enum
+from typing import Any, NamedTuple, cast
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Select,
+    SmallInteger,
+    UniqueConstraint,
+    bindparam,
+    exists,
+    select,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
-from pie.database import session, Base
+from pie.database import session, Base, commit_or_defer
+
+# Number of changes of ACL configuration of each guild.
+# See pie.acl.snapshot.ACLSnapshot for the consumer.
+_versions: dict[int, int] = {}
+
+
+def get_version(guild_id: int) -> int:
+    """Get version of guild's ACL configuration.
+
+    The number is increased every time any ACL object of the guild is added or
+    removed, so it can be used to invalidate cached data.
+    """
+    return _versions.get(guild_id, 0)
+
+
+def _bump_version(guild_id: int) -> None:
+    _versions[guild_id] = _versions.get(guild_id, 0) + 1
+
+
+def _exists(model: Any, **kwargs) -> bool:
+    """Check whether the ACL object exists, without loading it."""
+    criteria = [getattr(model, key) == value for key, value in kwargs.items()]
+    return bool(session.execute(select(exists().where(*criteria))).scalar())
 
 
 class ACLevel(enum.IntEnum):
@@ -18,62 +51,133 @@ class ACLevel(enum.IntEnum):
     EVERYONE = 0
 
 
+class ACDefaultView(NamedTuple):
+    """Read-only values of :class:`ACDefault`."""
+
+    guild_id: int
+    command: str
+    level: int
+
+
+class RoleOverwriteView(NamedTuple):
+    """Read-only values of :class:`RoleOverwrite`."""
+
+    guild_id: int
+    role_id: int
+    command: str
+    allow: bool
+
+
+class UserOverwriteView(NamedTuple):
+    """Read-only values of :class:`UserOverwrite`."""
+
+    guild_id: int
+    user_id: int
+    command: str
+    allow: bool
+
+
+class ChannelOverwriteView(NamedTuple):
+    """Read-only values of :class:`ChannelOverwrite`."""
+
+    guild_id: int
+    channel_id: int
+    command: str
+    allow: bool
+
+
+class ACLevelMappingView(NamedTuple):
+    """Read-only values of :class:`ACLevelMappping`."""
+
+    guild_id: int
+    role_id: int
+    level: int
+
+
 class ACDefault(Base):
     __tablename__ = "pie_acl_acdefault"
 
     idx: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     guild_id: Mapped[int] = mapped_column(BigInteger)
     command: Mapped[str] = mapped_column()
-    level: Mapped[ACLevel] = mapped_column(Enum(ACLevel))
+    # Older versions stored names of the levels, see pie.database.migrations
+    level: Mapped[int] = mapped_column(SmallInteger, info={"enum": ACLevel})
+
+    __table_args__ = (UniqueConstraint(guild_id, command),)
 
     @staticmethod
-    def add(guild_id: int, command: str, level: ACLevel) -> ACDefault | None:
-        if ACDefault.get(guild_id, command):
+    def add(
+        guild_id: int, command: str, level: ACLevel, *, commit: bool = True
+    ) -> ACDefault | None:
+        if _exists(ACDefault, guild_id=guild_id, command=command):
             return None
 
         default = ACDefault(guild_id=guild_id, command=command, level=level)
         session.add(default)
-        session.commit()
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return default
 
     @staticmethod
     def get(guild_id: int, command: str) -> ACDefault | None:
-        default = (
-            session.query(ACDefault)
-            .filter_by(guild_id=guild_id, command=command)
-            .one_or_none()
-        )
-        return default
+        return session.execute(
+            _ACDEFAULT_GET, {"guild_id": guild_id, "command": command}
+        ).scalar_one_or_none()
 
     @staticmethod
     def get_all(guild_id: int) -> list[ACDefault]:
-        query = session.query(ACDefault).filter_by(guild_id=guild_id).all()
-        return query
+        query = (
+            session.execute(_ACDEFAULT_GET_ALL, {"guild_id": guild_id}).scalars().all()
+        )
+        return cast(list[ACDefault], query)
+
+    @staticmethod
+    def get_all_rows(guild_id: int) -> list[ACDefaultView]:
+        """Get default levels of the guild as lightweight named tuples.
+
+        Use this instead of :meth:`get_all` if you only need to read the values.
+        """
+        rows = session.execute(_ACDEFAULT_GET_ALL_ROWS, {"guild_id": guild_id})
+        return [ACDefaultView._make(row) for row in rows]
 
     @staticmethod
-    def remove(guild_id: int, command: str) -> bool:
+    def remove(guild_id: int, command: str, *, commit: bool = True) -> bool:
         query = (
             session.query(ACDefault)
             .filter_by(guild_id=guild_id, command=command)
             .delete()
         )
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return query > 0
 
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__name__} "
-            + " ".join(f"{key}='{value}'" for key, value in self.dump().items())
-            + ">"
+            f"guild_id='{self.guild_id}' command='{self.command}' "
+            f"level='{ACLevel(self.level).name}'>"
         )
 
     def dump(self) -> dict[str, Any]:
         return {
             "guild_id": self.guild_id,
             "command": self.command,
-            "level": self.level.name,
+            "level": ACLevel(self.level).name,
         }
 
 
+# Statements of get() methods are built once and reused with different
+# parameters, so their compiled form is always found in the SQLAlchemy cache.
+_ACDEFAULT_GET = select(ACDefault).where(
+    ACDefault.guild_id == bindparam("guild_id"),
+    ACDefault.command == bindparam("command"),
+)
+_ACDEFAULT_GET_ALL = select(ACDefault).where(ACDefault.guild_id == bindparam("guild_id"))
+_ACDEFAULT_GET_ALL_ROWS = select(
+    ACDefault.guild_id, ACDefault.command, ACDefault.level
+).where(ACDefault.guild_id == bindparam("guild_id"))
+
+
 class RoleOverwrite(Base):
     __tablename__ = "pie_acl_role_overwrite"
 
@@ -83,47 +187,62 @@ class RoleOverwrite(Base):
     command: Mapped[str] = mapped_column()
     allow = Column(Boolean)
 
+    __table_args__ = (UniqueConstraint(guild_id, role_id, command),)
+
     @staticmethod
     def add(
-        guild_id: int, role_id: int, command: str, allow: bool
+        guild_id: int, role_id: int, command: str, allow: bool, *, commit: bool = True
     ) -> RoleOverwrite | None:
-        if RoleOverwrite.get(guild_id, role_id, command):
+        if _exists(RoleOverwrite, guild_id=guild_id, role_id=role_id, command=command):
             return None
         ro = RoleOverwrite(
             guild_id=guild_id, role_id=role_id, command=command, allow=allow
         )
         session.add(ro)
-        session.commit()
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return ro
 
     @staticmethod
     def get(guild_id: int, role_id: int, command: str) -> RoleOverwrite | None:
-        ro = (
-            session.query(RoleOverwrite)
-            .filter_by(guild_id=guild_id, role_id=role_id, command=command)
-            .one_or_none()
-        )
-        return ro
+        return session.execute(
+            _ROLE_OVERWRITE_GET,
+            {"guild_id": guild_id, "role_id": role_id, "command": command},
+        ).scalar_one_or_none()
 
     @staticmethod
     def get_all(guild_id: int) -> list[RoleOverwrite]:
-        query = session.query(RoleOverwrite).filter_by(guild_id=guild_id).all()
-        return query
+        query = (
+            session.execute(_ROLE_OVERWRITE_GET_ALL, {"guild_id": guild_id})
+            .scalars()
+            .all()
+        )
+        return cast(list[RoleOverwrite], query)
 
     @staticmethod
-    def remove(guild_id: int, role_id: int, command: str) -> bool:
+    def get_all_rows(guild_id: int) -> list[RoleOverwriteView]:
+        """Get overwrites of the guild as lightweight named tuples.
+
+        Use this instead of :meth:`get_all` if you only need to read the values.
+        """
+        rows = session.execute(_ROLE_OVERWRITE_GET_ALL_ROWS, {"guild_id": guild_id})
+        return [RoleOverwriteView._make(row) for row in rows]
+
+    @staticmethod
+    def remove(guild_id: int, role_id: int, command: str, *, commit: bool = True) -> bool:
         query = (
             session.query(RoleOverwrite)
             .filter_by(guild_id=guild_id, role_id=role_id, command=command)
             .delete()
         )
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return query > 0
 
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__name__} "
-            + " ".join(f"{key}='{value}'" for key, value in self.dump().items())
-            + ">"
+            f"guild_id='{self.guild_id}' role_id='{self.role_id}' allow='{self.allow}'>"
         )
 
     def dump(self) -> dict[str, Any]:
@@ -134,6 +253,22 @@ class RoleOverwrite(Base):
         }
 
 
+_ROLE_OVERWRITE_GET = select(RoleOverwrite).where(
+    RoleOverwrite.guild_id == bindparam("guild_id"),
+    RoleOverwrite.role_id == bindparam("role_id"),
+    RoleOverwrite.command == bindparam("command"),
+)
+_ROLE_OVERWRITE_GET_ALL = select(RoleOverwrite).where(
+    RoleOverwrite.guild_id == bindparam("guild_id")
+)
+_ROLE_OVERWRITE_GET_ALL_ROWS: Select[int, int, str, bool] = select(
+    RoleOverwrite.guild_id,
+    RoleOverwrite.role_id,
+    RoleOverwrite.command,
+    RoleOverwrite.allow,
+).where(RoleOverwrite.guild_id == bindparam("guild_id"))
+
+
 class UserOverwrite(Base):
     __tablename__ = "pie_acl_user_overwrite"
 
@@ -143,47 +278,62 @@ class UserOverwrite(Base):
     command: Mapped[str] = mapped_column()
     allow = Column(Boolean)
 
+    __table_args__ = (UniqueConstraint(guild_id, user_id, command),)
+
     @staticmethod
     def add(
-        guild_id: int, user_id: int, command: str, allow: bool
+        guild_id: int, user_id: int, command: str, allow: bool, *, commit: bool = True
     ) -> UserOverwrite | None:
-        if UserOverwrite.get(guild_id, user_id, command):
+        if _exists(UserOverwrite, guild_id=guild_id, user_id=user_id, command=command):
             return None
         uo = UserOverwrite(
             guild_id=guild_id, user_id=user_id, command=command, allow=allow
         )
         session.add(uo)
-        session.commit()
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return uo
 
     @staticmethod
     def get(guild_id: int, user_id: int, command: str) -> UserOverwrite | None:
-        uo = (
-            session.query(UserOverwrite)
-            .filter_by(guild_id=guild_id, user_id=user_id, command=command)
-            .one_or_none()
-        )
-        return uo
+        return session.execute(
+            _USER_OVERWRITE_GET,
+            {"guild_id": guild_id, "user_id": user_id, "command": command},
+        ).scalar_one_or_none()
 
     @staticmethod
     def get_all(guild_id: int) -> list[UserOverwrite]:
-        query = session.query(UserOverwrite).filter_by(guild_id=guild_id).all()
-        return query
+        query = (
+            session.execute(_USER_OVERWRITE_GET_ALL, {"guild_id": guild_id})
+            .scalars()
+            .all()
+        )
+        return cast(list[UserOverwrite], query)
+
+    @staticmethod
+    def get_all_rows(guild_id: int) -> list[UserOverwriteView]:
+        """Get overwrites of the guild as lightweight named tuples.
+
+        Use this instead of :meth:`get_all` if you only need to read the values.
+        """
+        rows = session.execute(_USER_OVERWRITE_GET_ALL_ROWS, {"guild_id": guild_id})
+        return [UserOverwriteView._make(row) for row in rows]
 
     @staticmethod
-    def remove(guild_id: int, user_id: int, command: str) -> bool:
+    def remove(guild_id: int, user_id: int, command: str, *, commit: bool = True) -> bool:
         query = (
             session.query(UserOverwrite)
             .filter_by(guild_id=guild_id, user_id=user_id, command=command)
             .delete()
         )
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return query > 0
 
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__name__} "
-            + " ".join(f"{key}='{value}'" for key, value in self.dump().items())
-            + ">"
+            f"guild_id='{self.guild_id}' user_id='{self.user_id}' allow='{self.allow}'>"
         )
 
     def dump(self) -> dict[str, Any]:
@@ -194,6 +344,22 @@ class UserOverwrite(Base):
         }
 
 
+_USER_OVERWRITE_GET = select(UserOverwrite).where(
+    UserOverwrite.guild_id == bindparam("guild_id"),
+    UserOverwrite.user_id == bindparam("user_id"),
+    UserOverwrite.command == bindparam("command"),
+)
+_USER_OVERWRITE_GET_ALL = select(UserOverwrite).where(
+    UserOverwrite.guild_id == bindparam("guild_id")
+)
+_USER_OVERWRITE_GET_ALL_ROWS: Select[int, int, str, bool] = select(
+    UserOverwrite.guild_id,
+    UserOverwrite.user_id,
+    UserOverwrite.command,
+    UserOverwrite.allow,
+).where(UserOverwrite.guild_id == bindparam("guild_id"))
+
+
 class ChannelOverwrite(Base):
     __tablename__ = "pie_acl_channel_overwrite"
 
@@ -203,47 +369,72 @@ class ChannelOverwrite(Base):
     command: Mapped[str] = mapped_column()
     allow = Column(Boolean)
 
+    __table_args__ = (UniqueConstraint(guild_id, channel_id, command),)
+
     @staticmethod
     def add(
-        guild_id: int, channel_id: int, command: str, allow: bool
+        guild_id: int,
+        channel_id: int,
+        command: str,
+        allow: bool,
+        *,
+        commit: bool = True,
     ) -> ChannelOverwrite | None:
-        if ChannelOverwrite.get(guild_id, channel_id, command):
+        if _exists(
+            ChannelOverwrite, guild_id=guild_id, channel_id=channel_id, command=command
+        ):
             return None
         co = ChannelOverwrite(
             guild_id=guild_id, channel_id=channel_id, command=command, allow=allow
         )
         session.add(co)
-        session.commit()
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return co
 
     @staticmethod
     def get(guild_id: int, channel_id: int, command: str) -> ChannelOverwrite | None:
-        co = (
-            session.query(ChannelOverwrite)
-            .filter_by(guild_id=guild_id, channel_id=channel_id, command=command)
-            .one_or_none()
-        )
-        return co
+        return session.execute(
+            _CHANNEL_OVERWRITE_GET,
+            {"guild_id": guild_id, "channel_id": channel_id, "command": command},
+        ).scalar_one_or_none()
 
     @staticmethod
     def get_all(guild_id: int) -> list[ChannelOverwrite]:
-        query = session.query(ChannelOverwrite).filter_by(guild_id=guild_id).all()
-        return query
+        query = (
+            session.execute(_CHANNEL_OVERWRITE_GET_ALL, {"guild_id": guild_id})
+            .scalars()
+            .all()
+        )
+        return cast(list[ChannelOverwrite], query)
+
+    @staticmethod
+    def get_all_rows(guild_id: int) -> list[ChannelOverwriteView]:
+        """Get overwrites of the guild as lightweight named tuples.
+
+        Use this instead of :meth:`get_all` if you only need to read the values.
+        """
+        rows = session.execute(_CHANNEL_OVERWRITE_GET_ALL_ROWS, {"guild_id": guild_id})
+        return [ChannelOverwriteView._make(row) for row in rows]
 
     @staticmethod
-    def remove(guild_id: int, channel_id: int, command: str) -> bool:
+    def remove(
+        guild_id: int, channel_id: int, command: str, *, commit: bool = True
+    ) -> bool:
         query = (
             session.query(ChannelOverwrite)
             .filter_by(guild_id=guild_id, channel_id=channel_id, command=command)
             .delete()
         )
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return query > 0
 
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__name__} "
-            + " ".join(f"{key}='{value}'" for key, value in self.dump().items())
-            + ">"
+            f"guild_id='{self.guild_id}' channel_id='{self.channel_id}' "
+            f"allow='{self.allow}'>"
         )
 
     def dump(self) -> dict[str, Any]:
@@ -254,51 +445,85 @@ class ChannelOverwrite(Base):
         }
 
 
+_CHANNEL_OVERWRITE_GET = select(ChannelOverwrite).where(
+    ChannelOverwrite.guild_id == bindparam("guild_id"),
+    ChannelOverwrite.channel_id == bindparam("channel_id"),
+    ChannelOverwrite.command == bindparam("command"),
+)
+_CHANNEL_OVERWRITE_GET_ALL = select(ChannelOverwrite).where(
+    ChannelOverwrite.guild_id == bindparam("guild_id")
+)
+_CHANNEL_OVERWRITE_GET_ALL_ROWS: Select[int, int, str, bool] = select(
+    ChannelOverwrite.guild_id,
+    ChannelOverwrite.channel_id,
+    ChannelOverwrite.command,
+    ChannelOverwrite.allow,
+).where(ChannelOverwrite.guild_id == bindparam("guild_id"))
+
+
 class ACLevelMappping(Base):
     __tablename__ = "pie_acl_aclevel_mapping"
 
     idx: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     guild_id: Mapped[int] = mapped_column(BigInteger)
     role_id: Mapped[int] = mapped_column(BigInteger)
-    level: Mapped[ACLevel] = mapped_column(Enum(ACLevel))
+    # Older versions stored names of the levels, see pie.database.migrations
+    level: Mapped[int] = mapped_column(SmallInteger, info={"enum": ACLevel})
+
+    __table_args__ = (UniqueConstraint(guild_id, role_id),)
 
     @staticmethod
-    def add(guild_id: int, role_id: int, level: ACLevel) -> ACLevelMappping | None:
-        if ACLevelMappping.get(guild_id, role_id):
+    def add(
+        guild_id: int, role_id: int, level: ACLevel, *, commit: bool = True
+    ) -> ACLevelMappping | None:
+        if _exists(ACLevelMappping, guild_id=guild_id, role_id=role_id):
             return None
         m = ACLevelMappping(guild_id=guild_id, role_id=role_id, level=level)
         session.add(m)
-        session.commit()
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return m
 
     @staticmethod
     def get(guild_id: int, role_id: int) -> ACLevelMappping | None:
-        m = (
-            session.query(ACLevelMappping)
-            .filter_by(guild_id=guild_id, role_id=role_id)
-            .one_or_none()
-        )
-        return m
+        return session.execute(
+            _ACLEVEL_MAPPING_GET, {"guild_id": guild_id, "role_id": role_id}
+        ).scalar_one_or_none()
 
     @staticmethod
     def get_all(guild_id: int) -> list[ACLevelMappping]:
-        m = session.query(ACLevelMappping).filter_by(guild_id=guild_id).all()
-        return m
+        query = (
+            session.execute(_ACLEVEL_MAPPING_GET_ALL, {"guild_id": guild_id})
+            .scalars()
+            .all()
+        )
+        return cast(list[ACLevelMappping], query)
 
     @staticmethod
-    def remove(guild_id: int, role_id: int) -> bool:
+    def get_all_rows(guild_id: int) -> list[ACLevelMappingView]:
+        """Get level mappings of the guild as lightweight named tuples.
+
+        Use this instead of :meth:`get_all` if you only need to read the values.
+        """
+        rows = session.execute(_ACLEVEL_MAPPING_GET_ALL_ROWS, {"guild_id": guild_id})
+        return [ACLevelMappingView._make(row) for row in rows]
+
+    @staticmethod
+    def remove(guild_id: int, role_id: int, *, commit: bool = True) -> bool:
         query = (
             session.query(ACLevelMappping)
             .filter_by(guild_id=guild_id, role_id=role_id)
             .delete()
         )
+        commit_or_defer(commit)
+        _bump_version(guild_id)
         return query > 0
 
     def __repr__(self) -> str:
         return (
             f"<{self.__class__.__name__} "
             f"guild_id='{self.guild_id}' role_id='{self.role_id}' "
-            f"level='{self.level.name}'>"
+            f"level='{ACLevel(self.level).name}'>"
         )
 
     def dump(self) -> dict[str, Any]:
@@ -307,3 +532,15 @@ class ACLevelMappping(Base):
             "role_id": self.role_id,
             "level": self.level,
         }
+
+
+_ACLEVEL_MAPPING_GET = select(ACLevelMappping).where(
+    ACLevelMappping.guild_id == bindparam("guild_id"),
+    ACLevelMappping.role_id == bindparam("role_id"),
+)
+_ACLEVEL_MAPPING_GET_ALL = select(ACLevelMappping).where(
+    ACLevelMappping.guild_id == bindparam("guild_id")
+)
+_ACLEVEL_MAPPING_GET_ALL_ROWS = select(
+    ACLevelMappping.guild_id, ACLevelMappping.role_id, ACLevelMappping.level
+).where(ACLevelMappping.guild_id == bindparam("guild_id"))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from pie.database import session
+from pie.acl.database import ACDefault, ACLevel, ACLevelMappping, get_version
+from pie.acl.database import UserOverwrite, ChannelOverwrite, RoleOverwrite
+
+# Loaded snapshots by guild ID
+_snapshots: dict[int, ACLSnapshot] = {}
+
+
+@event.listens_for(session, "after_rollback")
+def _clear_snapshots(_session: Session) -> None:
+    # Snapshots may have been loaded from the changes that were rolled back
+    _snapshots.clear()
+
+
+@dataclass
+class ACLSnapshot:
+    """In-memory copy of guild's ACL configuration.
+
+    Permission checks run on every command invocation. Instead of querying the
+    database for each command, role, user and channel, the whole configuration
+    of the guild is loaded at once and indexed for dictionary lookups.
+
+    Overwrite dictionaries are keyed by ``(object ID, command)``.
+
+    .. code-block:: python
+        :linenos:
+
+        snapshot = ACLSnapshot.load(guild.id)
+        allow: bool | None = snapshot.user_over.get((member.id, command))
+    """
+
+    guild_id: int
+    version: int
+    defaults: dict[str, ACLevel]
+    role_over: dict[tuple[int, str], bool]
+    user_over: dict[tuple[int, str], bool]
+    channel_over: dict[tuple[int, str], bool]
+    level_map: dict[int, ACLevel]
+
+    @staticmethod
+    def load(guild_id: int) -> ACLSnapshot:
+        """Get ACL snapshot of the guild.
+
+        The snapshot is cached until any ACL object of the guild is added or
+        removed.
+        """
+        version: int = get_version(guild_id)
+        snapshot = _snapshots.get(guild_id)
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        snapshot = ACLSnapshot(
+            guild_id=guild_id,
+            version=version,
+            defaults={
+                row.command: ACLevel(row.level)
+                for row in ACDefault.get_all_rows(guild_id)
+            },
+            role_over={
+                (row.role_id, row.command): row.allow
+                for row in RoleOverwrite.get_all_rows(guild_id)
+            },
+            user_over={
+                (row.user_id, row.command): row.allow
+                for row in UserOverwrite.get_all_rows(guild_id)
+            },
+            channel_over={
+                (row.channel_id, row.command): row.allow
+                for row in ChannelOverwrite.get_all_rows(guild_id)
+            },
+            level_map={
+                row.role_id: ACLevel(row.level)
+                for row in ACLevelMappping.get_all_rows(guild_id)
+            },
+        )
+        _snapshots[guild_id] = snapshot
+        return snapshot
@@ -1,10 +1,19 @@
+from __future__ import annotations
+
+import contextlib
 import importlib
 import os
+import sys
+from collections.abc import Iterator
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
 
 from pie.cli import COLOR
+from pie.database import migrations
 
 
 class Base(DeclarativeBase):
@@ -25,6 +34,147 @@ class Database:
 database = Database()
 session: Session = sessionmaker(database.db, future=True)()
 
+# How many deferred changes trigger immediate commit
+FLUSH_THRESHOLD: int = 100
+
+# Number of changes waiting for commit, see commit_or_defer()
+_pending: int = 0
+# Depth of nested bulk() blocks
+_bulk: int = 0
+
+
+@event.listens_for(session, "after_commit")
+@event.listens_for(session, "after_rollback")
+def _reset_pending(_session: Session) -> None:
+    global _pending
+    _pending = 0
+
+
+def commit_or_defer(commit: bool = True) -> None:
+    """Commit the session or leave the commit for later.
+
+    :param commit: Whether to commit right away. When ``False``, the change
+        is committed when the command finishes (see :func:`flush_after_invoke`),
+        by :func:`flush_now` or by any other commit of the session. If there
+        are too many deferred changes, the session is committed immediately.
+
+    Deferring commits is useful when a lot of changes are made at once, as
+    each commit has to wait for the database to write the data to disk.
+
+    Inside of :func:`bulk` block, nothing is committed until the block ends.
+    """
+    global _pending
+    if _bulk:
+        _pending += 1
+        return
+    if not commit:
+        _pending += 1
+        if _pending < FLUSH_THRESHOLD:
+            return
+    session.commit()
+
+
+def flush_now() -> None:
+    """Commit deferred changes, if there are any.
+
+    Changes made inside of :func:`bulk` block are left for the block.
+
+    If the commit fails, the changes are rolled back, so the session can be
+    used again.
+    """
+    if not _pending or _bulk:
+        return
+    try:
+        session.commit()
+    except SQLAlchemyError as exc:
+        session.rollback()
+        print(
+            f"Deferred database changes {COLOR.red}were rolled back{COLOR.none}: "
+            f"{COLOR.cursive}{exc}{COLOR.none}.",
+            file=sys.stderr,
+        )  # noqa: T001
+
+
+async def flush_after_invoke(_ctx: Any) -> None:
+    """Commit changes deferred by the command.
+
+    This is the ``after_invoke`` hook of the bot, so deferred changes never
+    outlive the command that made them. discord.py calls it even if the
+    command fails.
+    """
+    flush_now()
+
+
+@contextlib.contextmanager
+def bulk() -> Iterator[None]:
+    """Run all database changes of the block in one transaction.
+
+    .. code-block:: python
+        :linenos:
+
+        with database.bulk():
+            for module in modules:
+                await bot.load_extension(module)
+
+    Commits requested by the models are skipped and the session is committed
+    once, when the outermost block ends. If the block raises an exception,
+    the changes are rolled back instead.
+    """
+    global _bulk
+    _bulk += 1
+    try:
+        yield
+    except BaseException:
+        _bulk -= 1
+        if not _bulk:
+            session.rollback()
+        raise
+    _bulk -= 1
+    if not _bulk:
+        session.commit()
+
+
+def dialect_insert(model: type[Base]) -> postgresql.Insert | sqlite.Insert:
+    """Get ``INSERT`` statement supporting ``ON CONFLICT`` clauses.
+
+    :param model: Database model to insert into.
+    :return: PostgreSQL or SQLite specific insert construct, based on the
+        database the bot is connected to.
+
+    Use it to replace get-then-add sequences with a single upsert:
+
+    .. code-block:: python
+        :linenos:
+
+        stmt = dialect_insert(Model).values(guild_id=guild_id, value=value)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["guild_id"], set_={"value": stmt.excluded.value}
+        )
+        session.execute(stmt)
+    """
+    if database.db.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+class BulkAddMixin:
+    """Mixin adding bulk insertion to database models."""
+
+    @classmethod
+    def add_many(cls, rows: list[dict[str, Any]]) -> None:
+        """Insert multiple rows using one statement and one commit.
+
+        :param rows: Column values of the rows, one dictionary per row.
+
+        SQLAlchemy batches the rows into multi-row ``INSERT`` statements, which
+        is much faster than calling ``add()`` in a loop. Unlike ``add()``,
+        no duplicity checks are performed and no objects are returned.
+        """
+        if not rows:
+            return
+        session.execute(insert(cls), rows)
+        commit_or_defer()
+
 
 def init_core():
     """Load core models and create their tables.
@@ -48,6 +198,7 @@ def init_core():
             raise
 
     Base.metadata.create_all(database.db)
+    migrations.upgrade(database.db, Base.metadata)
     session.commit()
 
 
@@ -59,6 +210,7 @@ def init_modules():
     _import_database_tables()
 
     Base.metadata.create_all(database.db)
+    migrations.upgrade(database.db, Base.metadata)
     session.commit()
 
 
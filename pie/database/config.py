@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+from sqlalchemy import select
 from sqlalchemy.orm import mapped_column, Mapped
 
-from pie.database import session, Base
+from pie.database import session, Base, commit_or_defer, dialect_insert
+
+# Primary key of the only configuration row, if it was created by this version.
+# Older versions let the database pick it, so it may be different.
+_IDX: int = 1
+
+# Process-wide instance of the configuration, see Config.get()
+_cached: Config | None = None
 
 
 class Config(Base):
@@ -37,18 +45,40 @@ class Config(Base):
            * - status
              - :class:`str`
              - ``online``
+
+        The object is only loaded once and then served from memory. It is
+        detached from the session, so commits elsewhere don't expire it.
         """
-        query = session.query(Config).one_or_none()
+        global _cached
+        if _cached is not None:
+            return _cached
+
+        query = session.get(Config, _IDX)
+        if query is None:
+            query = session.scalars(select(Config).order_by(Config.idx)).first()
         if query is None:
-            query = Config()
+            query = Config(idx=_IDX)
             session.add(query)
             session.commit()
+            session.refresh(query)
+        session.expunge(query)
+
+        _cached = query
         return query
 
     def save(self) -> None:
         """Save global settings."""
-        session.merge(self)
-        session.commit()
+        global _cached
+        values = {
+            "prefix": self.prefix,
+            "language": self.language,
+            "status": self.status,
+        }
+        stmt = dialect_insert(Config).values(idx=self.idx, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=["idx"], set_=values)
+        session.execute(stmt)
+        commit_or_defer()
+        _cached = self
 
     def __repr__(self) -> str:
         return (
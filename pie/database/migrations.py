@@ -0,0 +1,269 @@
+"""Upgrades of tables created by older versions of the bot.
+
+:meth:`sqlalchemy.schema.MetaData.create_all` only creates missing tables, it
+does not change the existing ones. Functions of this module are run on startup
+by :meth:`pie.database.init_core` and :meth:`pie.database.init_modules` and
+bring the existing tables up to date with their models.
+"""
+
+from __future__ import annotations
+
+import enum
+import os
+
+from sqlalchemy import (
+    Case,
+    Connection,
+    Dialect,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy import table as table_clause
+
+from pie.cli import COLOR
+from pie.exceptions import DatabaseUpgradeError
+
+# Tables that got their unique constraints after they had been released.
+# No other table is changed by add_unique_constraints().
+UNIQUE_CONSTRAINT_TABLES: frozenset[str] = frozenset(
+    {
+        "base_base_autothread",
+        "base_base_bookmarks",
+        "base_base_userpin",
+        "base_base_userthread",
+        "language_members",
+        "pie_acl_acdefault",
+        "pie_acl_aclevel_mapping",
+        "pie_acl_channel_overwrite",
+        "pie_acl_role_overwrite",
+        "pie_acl_user_overwrite",
+    }
+)
+
+
+def upgrade(engine: Engine, metadata: MetaData) -> None:
+    """Upgrade all tables of the metadata.
+
+    Duplicate rows are only removed when the ``DB_REMOVE_DUPLICATES``
+    environment variable is set to ``1``, see :func:`add_unique_constraints`.
+    """
+    remove_duplicates: bool = os.getenv("DB_REMOVE_DUPLICATES", "0") == "1"
+    with engine.begin() as connection:
+        add_unique_constraints(connection, metadata, remove_duplicates=remove_duplicates)
+        convert_enum_names(connection, metadata)
+
+
+def add_unique_constraints(
+    connection: Connection, metadata: MetaData, *, remove_duplicates: bool = False
+) -> None:
+    """Create unique constraints that are missing in the database.
+
+    Only tables listed in :data:`UNIQUE_CONSTRAINT_TABLES` are changed.
+
+    The constraints are created as unique indexes, because SQLite can't add
+    constraints to existing tables. Both PostgreSQL and SQLite use unique
+    indexes for ``ON CONFLICT`` clauses the same way they use constraints.
+
+    :param remove_duplicates: Whether to remove duplicate rows, which would
+        prevent the index from being created. The row that was added last is
+        kept.
+    :raises DatabaseUpgradeError: The table contains duplicate rows and they
+        are not allowed to be removed.
+    """
+    inspector = inspect(connection)
+    for table in metadata.sorted_tables:
+        if table.name not in UNIQUE_CONSTRAINT_TABLES:
+            continue
+        if not inspector.has_table(table.name):
+            continue
+
+        existing: set[frozenset[str]] = {
+            frozenset(name for name in constraint["column_names"] if name is not None)
+            for constraint in inspector.get_unique_constraints(table.name)
+        }
+        existing |= {
+            frozenset(name for name in index["column_names"] if name is not None)
+            for index in inspector.get_indexes(table.name)
+            if index["unique"]
+        }
+
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint):
+                continue
+            columns: list[str] = [column.name for column in constraint.columns]
+            if frozenset(columns) in existing:
+                continue
+
+            duplicates: int = _count_duplicates(connection, table, columns)
+            if duplicates and not remove_duplicates:
+                print(
+                    f"Table {COLOR.red}{table.name}{COLOR.none} has {duplicates} "
+                    f"duplicate rows on {', '.join(columns)}."
+                )  # noqa: T001
+                raise DatabaseUpgradeError(
+                    f"Table '{table.name}' can't get unique constraint on "
+                    f"{', '.join(columns)}, it has {duplicates} duplicate rows. "
+                    "Remove them, or set DB_REMOVE_DUPLICATES=1 to keep only "
+                    "the newest ones."
+                )
+
+            removed: int = 0
+            if duplicates:
+                removed = _remove_duplicates(connection, table, columns)
+            _create_unique_index(connection, table, columns)
+            existing.add(frozenset(columns))
+            print(
+                f"Table {COLOR.green}{table.name}{COLOR.none} got unique "
+                f"constraint on {', '.join(columns)}, {removed} duplicates removed."
+            )  # noqa: T001
+
+
+def _count_duplicates(connection: Connection, table: Table, columns: list[str]) -> int:
+    """Count rows that have the same values in the columns as another row."""
+    groups = (
+        select(func.count().label("rows"))
+        .select_from(table)
+        .group_by(*[table.c[column] for column in columns])
+        .subquery()
+    )
+    count = connection.execute(select(func.sum(groups.c.rows - 1))).scalar()
+    return int(count or 0)
+
+
+def _remove_duplicates(connection: Connection, table: Table, columns: list[str]) -> int:
+    """Remove rows with the same values in the columns, keep the newest one.
+
+    ``NULL`` values are grouped together, so guild-wide preferences are made
+    unique as well.
+    """
+    primary_key = list(table.primary_key.columns)
+    if len(primary_key) != 1:
+        return 0
+    idx = primary_key[0]
+
+    newest = select(func.max(idx)).group_by(*[table.c[column] for column in columns])
+    result = connection.execute(delete(table).where(idx.not_in(newest)))
+    return result.rowcount
+
+
+def _create_unique_index(
+    connection: Connection, table: Table, columns: list[str]
+) -> None:
+    quote = connection.dialect.identifier_preparer.quote
+    name: str = "uq_" + "_".join([table.name, *columns])
+    connection.exec_driver_sql(
+        f"CREATE UNIQUE INDEX {quote(name)} ON {quote(table.name)} "
+        f"({', '.join(quote(column) for column in columns)})"
+    )
+
+
+def convert_enum_names(connection: Connection, metadata: MetaData) -> None:
+    """Convert columns storing names of enum members to their values.
+
+    Integer columns declaring their enum as ``info={"enum": ...}`` used to be
+    :class:`sqlalchemy.types.Enum` columns, which store names of the members.
+
+    PostgreSQL changes the column type in place. SQLite can't do that, so the
+    table is created again and the rows are copied into it.
+    """
+    inspector = inspect(connection)
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        types = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+        columns: dict[str, type[enum.Enum]] = {
+            c.name: c.info["enum"]
+            for c in table.columns
+            if "enum" in c.info
+            and c.name in types
+            and not isinstance(types[c.name], Integer)
+        }
+        if not columns:
+            continue
+
+        if connection.dialect.name == "sqlite":
+            _copy_table(connection, table, columns, list(types))
+        else:
+            _alter_columns(connection, table, columns)
+        print(
+            f"Table {COLOR.green}{table.name}{COLOR.none} got "
+            f"{', '.join(columns)} converted from names to values."
+        )  # noqa: T001
+
+
+def _enum_value(name: str, enum_type: type[enum.Enum]) -> Case:
+    """Get SQL expression mapping the member names to their values."""
+    return case(
+        {member.name: member.value for member in enum_type},
+        value=cast(column(name), String),
+    )
+
+
+def _alter_columns(
+    connection: Connection, table: Table, columns: dict[str, type[enum.Enum]]
+) -> None:
+    for statement in _alter_statements(connection.dialect, table, columns):
+        connection.exec_driver_sql(statement)
+
+
+def _alter_statements(
+    dialect: Dialect, table: Table, columns: dict[str, type[enum.Enum]]
+) -> list[str]:
+    """Build ``ALTER TABLE`` statements changing the columns in place."""
+    quote = dialect.identifier_preparer.quote
+    statements: list[str] = []
+    for name, enum_type in columns.items():
+        new_type: str = table.c[name].type.compile(dialect=dialect)
+        using: str = str(
+            _enum_value(name, enum_type).compile(
+                dialect=dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+        statements.append(
+            f"ALTER TABLE {quote(table.name)} ALTER COLUMN {quote(name)} "
+            f"TYPE {new_type} USING {using}"
+        )
+    return statements
+
+
+def _copy_table(
+    connection: Connection,
+    table: Table,
+    columns: dict[str, type[enum.Enum]],
+    existing: list[str],
+) -> None:
+    quote = connection.dialect.identifier_preparer.quote
+    old_name: str = table.name + "_old"
+    connection.exec_driver_sql(
+        f"ALTER TABLE {quote(table.name)} RENAME TO {quote(old_name)}"
+    )
+    # Indexes are renamed with the table, drop them so they can be created again
+    for index in inspect(connection).get_indexes(old_name):
+        if index["name"] is not None:
+            connection.exec_driver_sql(f"DROP INDEX {quote(index['name'])}")
+    table.create(connection)
+
+    names: list[str] = [c.name for c in table.columns if c.name in existing]
+    values = [
+        _enum_value(name, columns[name]) if name in columns else column(name)
+        for name in names
+    ]
+    connection.execute(
+        insert(table).from_select(
+            names, select(*values).select_from(table_clause(old_name))
+        )
+    )
+    connection.exec_driver_sql(f"DROP TABLE {quote(old_name)}")
@@ -21,6 +21,12 @@ class DotEnvException(PumpkinException):
     pass
 
 
+class DatabaseUpgradeError(PumpkinException):
+    """Raised when existing database table can't be upgraded to its model."""
+
+    pass
+
+
 class ModuleException(PumpkinException):
     """Raised when module-related error occurs.
 
@@ -1,4 +1,3 @@
-import ring
 from pathlib import Path
 
 import discord
@@ -143,33 +142,10 @@ class Translator:
 
         return Config.get().language
 
-    # While we could be using just functools.lru_cache(), using ring
-    # is a better option, because it allows us to add automatic deletion
-    # into the mix. Because the member can change their preferred language
-    # dynamically, invalidation is a preferred behavior.
-    # In case this expiration value gets changed you should also change
-    # the text in the language module under '[caching]' section.
-    @ring.lru(expire=120)
     def _get_user_language(self, guild_id: int, user_id: int) -> str | None:
-        """Get user's language preference.
+        """Get user's language preference."""
+        return MemberLanguage.get_language(guild_id, user_id)
 
-        This value may be out-of-sync for two minutes after change because of
-        caching.
-        """
-        user = MemberLanguage.get(guild_id, user_id)
-        if user and getattr(user, "language", None) is not None:
-            return user.language
-        return None
-
-    @ring.lru(expire=120)
     def _get_guild_language(self, guild_id: int) -> str | None:
-        """Get guild's language preference.
-
-        This value may be out-of-sync for two minutes after change because of
-        caching.
-        """
-        guild = GuildLanguage.get(guild_id)
-        if guild is not None and getattr(guild, "language", None) is not None:
-            return guild.language
-
-        return None
+        """Get guild's language preference."""
+        return GuildLanguage.get_language(guild_id)
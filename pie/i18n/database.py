@@ -1,9 +1,24 @@
 from __future__ import annotations
 
-from sqlalchemy import BigInteger
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, UniqueConstraint, bindparam, event, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
 
-from pie.database import session, Base
+from pie.database import session, Base, commit_or_defer, dialect_insert
+
+# Maximal number of cached member preferences
+_CACHE_SIZE: int = 4096
+
+# Language preferences used by the translator. Missing preferences are stored
+# as None, so they are not queried again. Entries are updated on every write.
+_guild_languages: dict[int, str | None] = {}
+_member_languages: dict[tuple[int, int], str | None] = {}
+
+
+@event.listens_for(session, "after_rollback")
+def _clear_cache(_session: Session) -> None:
+    # Cached values may come from the changes that were rolled back
+    _guild_languages.clear()
+    _member_languages.clear()
 
 
 class GuildLanguage(Base):
@@ -30,6 +45,9 @@ class GuildLanguage(Base):
     def __eq__(self, obj) -> bool:
         return type(self) is type(obj) and self.guild_id == obj.guild_id
 
+    def __hash__(self) -> int:
+        return hash((type(self), self.guild_id))
+
     def dump(self) -> dict[str, int | str]:
         return {
             "guild_id": self.guild_id,
@@ -46,13 +64,16 @@ class GuildLanguage(Base):
             responsibility to make sure it has correct value.
         :return: Created guild language preference.
         """
-        preference = GuildLanguage(guild_id=guild_id, language=language)
-
-        # remove old language preference
-        session.query(GuildLanguage).filter_by(guild_id=guild_id).delete()
-
-        session.add(preference)
-        session.commit()
+        stmt = dialect_insert(GuildLanguage).values(guild_id=guild_id, language=language)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["guild_id"], set_={"language": stmt.excluded.language}
+        )
+        preference = session.scalars(
+            stmt.returning(GuildLanguage),
+            execution_options={"populate_existing": True},
+        ).one()
+        commit_or_defer()
+        _guild_languages[guild_id] = language
         return preference
 
     @staticmethod
@@ -62,8 +83,28 @@ class GuildLanguage(Base):
         :param guild_id: Guild ID.
         :return: Guild language preference or ``None``.
         """
-        query = session.query(GuildLanguage).filter_by(guild_id=guild_id).one_or_none()
-        return query
+        return session.execute(
+            _GUILD_LANGUAGE_GET, {"guild_id": guild_id}
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def get_language(guild_id: int) -> str | None:
+        """Get guild language.
+
+        :param guild_id: Guild ID.
+        :return: Language code or ``None``.
+
+        The value is cached in memory and kept in sync by :meth:`add` and
+        :meth:`remove`.
+        """
+        try:
+            return _guild_languages[guild_id]
+        except KeyError:
+            pass
+        preference = GuildLanguage.get(guild_id)
+        language = getattr(preference, "language", None)
+        _guild_languages[guild_id] = language
+        return language
 
     @staticmethod
     def remove(guild_id: int) -> int:
@@ -73,10 +114,17 @@ class GuildLanguage(Base):
         :return: Number of deleted preferences, always ``0`` or ``1``.
         """
         query = session.query(GuildLanguage).filter_by(guild_id=guild_id).delete()
-        session.commit()
+        commit_or_defer()
+        _guild_languages[guild_id] = None
         return query
 
 
+# Statements are built once, so their compiled form is reused by SQLAlchemy
+_GUILD_LANGUAGE_GET = select(GuildLanguage).where(
+    GuildLanguage.guild_id == bindparam("guild_id")
+)
+
+
 class MemberLanguage(Base):
     """Language preference of the user.
 
@@ -93,6 +141,8 @@ class MemberLanguage(Base):
     member_id: Mapped[int] = mapped_column(BigInteger)
     language: Mapped[str] = mapped_column()
 
+    __table_args__ = (UniqueConstraint(guild_id, member_id),)
+
     def __repr__(self) -> str:
         return (
             f'<MemberLanguage idx="{self.idx}" guild_id="{self.guild_id}" '
@@ -106,6 +156,9 @@ class MemberLanguage(Base):
             and self.member_id == obj.member_id
         )
 
+    def __hash__(self) -> int:
+        return hash((type(self), self.guild_id, self.member_id))
+
     def dump(self) -> dict[str, int | str]:
         return {
             "guild_id": self.guild_id,
@@ -124,16 +177,19 @@ class MemberLanguage(Base):
             responsibility to make sure it has correct value.
         :return: Created member language preference.
         """
-        preference = MemberLanguage.get(guild_id, member_id)
-        if preference:
-            preference.language = language
-        else:
-            preference = MemberLanguage(
-                guild_id=guild_id, member_id=member_id, language=language
-            )
-            session.add(preference)
-
-        session.commit()
+        stmt = dialect_insert(MemberLanguage).values(
+            guild_id=guild_id, member_id=member_id, language=language
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["guild_id", "member_id"],
+            set_={"language": stmt.excluded.language},
+        )
+        preference = session.scalars(
+            stmt.returning(MemberLanguage),
+            execution_options={"populate_existing": True},
+        ).one()
+        commit_or_defer()
+        _member_languages[(guild_id, member_id)] = language
         return preference
 
     @staticmethod
@@ -144,12 +200,32 @@ class MemberLanguage(Base):
         :param member_id: Member ID.
         :return: Member language preference or ``None``.
         """
-        query = (
-            session.query(MemberLanguage)
-            .filter_by(guild_id=guild_id, member_id=member_id)
-            .one_or_none()
-        )
-        return query
+        return session.execute(
+            _MEMBER_LANGUAGE_GET, {"guild_id": guild_id, "member_id": member_id}
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def get_language(guild_id: int, member_id: int) -> str | None:
+        """Get member language.
+
+        :param guild_id: Guild ID.
+        :param member_id: Member ID.
+        :return: Language code or ``None``.
+
+        The value is cached in memory and kept in sync by :meth:`add` and
+        :meth:`remove`.
+        """
+        key = (guild_id, member_id)
+        try:
+            return _member_languages[key]
+        except KeyError:
+            pass
+        preference = MemberLanguage.get(guild_id, member_id)
+        language = getattr(preference, "language", None)
+        if len(_member_languages) >= _CACHE_SIZE:
+            _member_languages.clear()
+        _member_languages[key] = language
+        return language
 
     @staticmethod
     def remove(guild_id: int, member_id: int) -> int:
@@ -164,5 +240,12 @@ class MemberLanguage(Base):
             .filter_by(guild_id=guild_id, member_id=member_id)
             .delete()
         )
-        session.commit()
+        commit_or_defer()
+        _member_languages[(guild_id, member_id)] = None
         return query
+
+
+_MEMBER_LANGUAGE_GET = select(MemberLanguage).where(
+    MemberLanguage.guild_id == bindparam("guild_id"),
+    MemberLanguage.member_id == bindparam("member_id"),
+)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from sqlalchemy import BigInteger
 from sqlalchemy.orm import Mapped, mapped_column
 
-from pie.database import session, Base
+from pie.database import session, Base, commit_or_defer
 
 
 class LogConf(Base):
@@ -163,7 +163,7 @@ class LogConf(Base):
                 module=module,
             )
         session.merge(query)
-        session.commit()
+        commit_or_defer()
         return query
 
     @staticmethod
@@ -199,7 +199,7 @@ class LogConf(Base):
             .filter_by(scope=scope, guild_id=guild_id, module=module)
             .delete()
         )
-        session.commit()
+        commit_or_defer()
         return count > 0
 
     @staticmethod
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import configparser
 import git
 import hashlib
+import os
 import re
 import subprocess  # nosec: B404
 import sys
@@ -15,6 +15,50 @@ RE_QUOTE = r"(\"|\"\"\"|')"
 RE_NAME = r"[a-z_][0-9a-z_]+"
 RE_NAMES = r"[a-z0-9_,\s" + RE_QUOTE + r"]+"
 
+_NAME_RE = re.compile(r"(__name__)\s*=\s*" + RE_QUOTE + "(" + RE_NAME + ")" + RE_QUOTE)
+_ALL_RE = re.compile(r"(__all__)\s*=\s*\((" + RE_NAMES + r")\)")
+_VALID_NAME_RE = re.compile(RE_NAME)
+# Lines of legacy '__init__.py' assigning '__name__' or '__all__'
+_LEGACY_LINE_RE = re.compile(
+    r"^[^\S\n]*((__name__|__all__)[^\n]*=[^\n]*?)[^\S\n]*$", re.M
+)
+
+_SECTION_RE = re.compile(r"\[([^\]]+)\]")
+_OPTION_RE = re.compile(r"([^=:\s][^=:]*?)\s*[=:]\s*(.*)")
+
+
+def _read_conf(text: str, section: str) -> dict[str, str]:
+    """Read options of one section of INI file.
+
+    Only the subset of the syntax used by ``repo.conf`` is supported: section
+    headers, ``key = value`` options, indented continuation lines and comments.
+    Values of multi-line options are joined with newlines, like
+    :class:`configparser.ConfigParser` does.
+    """
+    options: dict[str, str] = {}
+    current: str | None = None
+    key: str | None = None
+    for line in text.splitlines():
+        stripped: str = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if line[0].isspace() and key is not None:
+            options[key] += "\n" + stripped
+            continue
+
+        key = None
+        matched: re.Match | None = _SECTION_RE.fullmatch(stripped)
+        if matched is not None:
+            current = matched.group(1)
+            continue
+        if current != section:
+            continue
+        matched = _OPTION_RE.fullmatch(stripped)
+        if matched is not None:
+            key = matched.group(1).lower()
+            options[key] = matched.group(2)
+    return options
+
 
 class RepositoryManager:
     """Module repository manager.
@@ -27,11 +71,16 @@ class RepositoryManager:
 
     repositories: list[Repository]
     log: list[str]
+    # Found repositories by their names, see get_repository()
+    _by_name: dict[str, Repository]
+    # Loaded repositories and modification times of their metadata files
+    _cache: dict[Path, tuple[int, Repository]]
 
     def __new__(cls, *args, **kwargs):
         """Create singleton instance."""
         if RepositoryManager.__instance is None:
             RepositoryManager.__instance = object.__new__(cls, *args, **kwargs)
+            RepositoryManager.__instance._cache = {}
         return RepositoryManager.__instance
 
     def __init__(self):
@@ -46,15 +95,32 @@ class RepositoryManager:
         repositories: list[Repository] = []
 
         repo_dir: Path = Path("modules/").resolve()
-        found_dirs: list[Path] = sorted(
-            [d for d in repo_dir.iterdir() if d.is_dir() and d.name != "__pycache__"]
-        )
+        # Directory entries carry the file type, is_dir() does not need stat()
+        with os.scandir(repo_dir) as entries:
+            found_dirs: list[Path] = sorted(
+                Path(entry.path)
+                for entry in entries
+                if entry.is_dir() and entry.name != "__pycache__"
+            )
+
+        cache: dict[Path, tuple[int, Repository]] = {}
 
         for directory in found_dirs:
             # test for signs of the directory being a repository
             if not (directory / "__init__.py").is_file():
                 continue
 
+            # reuse the repository if its metadata have not changed
+            metadata: Path = directory / "repo.conf"
+            if not metadata.is_file():
+                metadata = directory / "__init__.py"
+            mtime: int = metadata.stat().st_mtime_ns
+            cached = self._cache.get(directory)
+            if cached is not None and cached[0] == mtime:
+                repositories.append(cached[1])
+                cache[directory] = cached
+                continue
+
             # try to initiate the repository
             try:
                 repository = Repository(directory)
@@ -66,29 +132,33 @@ class RepositoryManager:
 
             # no error found, the directory is a repository
             repositories.append(repository)
+            cache[directory] = (mtime, repository)
 
         self.repositories = repositories
+        # first repository wins if multiple of them have the same name
+        self._by_name = {r.name: r for r in reversed(repositories)}
+        self._cache = cache
 
     def get_repository(self, name: str) -> Repository | None:
         """Get repository by its name."""
-        for repository in self.repositories:
-            if repository.name == name:
-                return repository
-        return None
+        return self._by_name.get(name)
 
 
 class Repository:
     """Module repository."""
 
-    __slots__ = ("path", "branch", "name", "module_names")
+    __slots__ = ("path", "branch", "name", "module_names", "_repos")
 
     path: Path
     branch: str
     name: str
     module_names: list[str]
+    # Git repositories by whether they were searched in parent directories
+    _repos: dict[bool, git.repo.base.Repo]
 
     def __init__(self, path: Path, branch: str | None = None):
         self.path: Path = path
+        self._repos = {}
         if branch is not None:
             self.change_branch(branch)
         self.set_facts()
@@ -99,20 +169,33 @@ class Repository:
             f"name='{self.name}' modules='{', '.join(self.module_names)}'>"
         )
 
+    @property
+    def _git_repo(self) -> git.repo.base.Repo:
+        """Get the git repository.
+
+        The base repository is a part of the bot's repository, so its ``.git``
+        directory is searched for in parent directories. The name is not known
+        before :meth:`set_facts` runs, so the object is cached for each way of
+        the lookup separately.
+        """
+        is_base: bool = getattr(self, "name", "") == "base"
+        repo = self._repos.get(is_base)
+        if repo is None:
+            repo = git.repo.base.Repo(str(self.path), search_parent_directories=is_base)
+            self._repos[is_base] = repo
+        return repo
+
     @property
     def head_commit(self) -> git.objects.commit.Commit:
         """Get the last commit."""
-        is_base: bool = self.name == "base"
-        repo = git.repo.base.Repo(str(self.path), search_parent_directories=is_base)
-        return repo.head.commit
+        return self._git_repo.head.commit
 
     def change_branch(self, branch: str) -> None:
         """Change the git branch of the repository.
 
         :raises ValueError: Output of git if an error occurs.
         """
-        is_base: bool = getattr(self, "name", "") == "base"
-        repo = git.repo.base.Repo(str(self.path), search_parent_directories=is_base)
+        repo = self._git_repo
         repo.remotes.origin.fetch()
         try:
             repo.git.checkout(branch)
@@ -128,14 +211,15 @@ class Repository:
         if not conf.is_file():
             return self.set_facts_legacy()
 
-        config = configparser.ConfigParser()
-        config.read(conf)
+        config: dict[str, str] = _read_conf(
+            conf.read_text(encoding="utf-8"), "repository"
+        )
 
-        name: str | None = config.get("repository", "name", fallback=None)
+        name: str | None = config.get("name")
         if not name:
             raise RepositoryMetadataError("'repo.conf' does not have 'name' key.")
 
-        modules: str | None = config.get("repository", "modules", fallback=None)
+        modules: str | None = config.get("modules")
         if not modules:
             raise RepositoryMetadataError("'repo.conf' does not have 'modules' key.")
 
@@ -155,16 +239,13 @@ class Repository:
         name: str | None = None
         module_names: list[str] = []
 
-        with open(init) as handle:
-            for line in handle.readlines():
-                line = line.strip()
-                if "=" not in line:
-                    continue
-
-                if line.startswith("__name__"):
-                    name = self._regex_get_name(line)
-                if line.startswith("__all__"):
-                    module_names = self._regex_get_modules(line)
+        text: str = init.read_text(encoding="utf-8")
+        for matched in _LEGACY_LINE_RE.finditer(text):
+            line, variable = matched.groups()
+            if variable == "__name__":
+                name = self._regex_get_name(line)
+            else:
+                module_names = self._regex_get_modules(line)
 
         if name is None:
             raise RepositoryMetadataError(
@@ -175,22 +256,13 @@ class Repository:
                 f"Specification of a repository at '{self.path}' "
                 "is missing a list of modules."
             )
-        for module_name in module_names:
-            if not (self.path / module_name).is_dir():
-                raise RepositoryMetadataError(
-                    f"Specification of a repository at '{self.path}' "
-                    f"includes link to invalid module '{module_name}'."
-                )
 
         self.name = name
         self.module_names = module_names
 
     def _regex_get_name(self, line: str) -> str:
         """Get name from line using regex."""
-        regex: str = (
-            r"(__name__)(\s*)(=)(\s*)" + RE_QUOTE + "(" + RE_NAME + ")" + RE_QUOTE
-        )
-        matched: re.Match | None = re.fullmatch(regex, line)
+        matched: re.Match | None = _NAME_RE.fullmatch(line)
         if matched is None:
             raise RepositoryMetadataError(
                 f"Repository at '{self.path}' has invalid name."
@@ -200,8 +272,7 @@ class Repository:
 
     def _regex_get_modules(self, line: str) -> list[str]:
         """Get tuple of module names using regex."""
-        regex: str = r"(__all__)(\s*)(=)(\s*)" + r"\((" + RE_NAMES + r")\)"
-        matched: re.Match | None = re.fullmatch(regex, line)
+        matched: re.Match | None = _ALL_RE.fullmatch(line)
         if matched is None:
             raise RepositoryMetadataError(
                 f"Repository at '{self.path}' has "
@@ -210,17 +281,27 @@ class Repository:
         names: str = matched.groups()[-1]
         list_of_names = [n.strip(" \"'") for n in names.split(",")]
         list_of_names = [n for n in list_of_names if len(n)]
+
+        # Directory entries carry the file type, so the files of each module
+        # can be checked without calling stat() on every one of them
+        with os.scandir(self.path) as entries:
+            directories: dict[str, str] = {e.name: e.path for e in entries if e.is_dir()}
+
         for name in list_of_names:
-            if re.fullmatch(RE_NAME, name) is None:
+            if _VALID_NAME_RE.fullmatch(name) is None:
                 raise RepositoryMetadataError(
                     f"Repository at '{self.path}' specification "
                     f"contains invalid name for included module '{name}'."
                 )
-            if not (self.path / name / "__init__.py").is_file():
+            files: set[str] = set()
+            if name in directories:
+                with os.scandir(directories[name]) as entries:
+                    files = {e.name for e in entries if e.is_file()}
+            if "__init__.py" not in files:
                 raise RepositoryMetadataError(
                     f"Module '{name}' is missing its init file."
                 )
-            if not (self.path / name / "module.py").is_file():
+            if "module.py" not in files:
                 raise RepositoryMetadataError(
                     f"Module '{name}' is missing its module file."
                 )
@@ -244,9 +325,7 @@ class Repository:
 
         :return: Git output
         """
-        is_base: bool = self.name == "base"
-        repo = git.repo.base.Repo(str(self.path), search_parent_directories=is_base)
-        result: str = repo.git.pull(force=force)
+        result: str = self._git_repo.git.pull(force=force)
         return result
 
     def git_reset_pull(self) -> str:
@@ -254,10 +333,7 @@ class Repository:
 
         :return: Git output
         """
-        is_base: bool = self.name == "base"
-
-        repo = git.repo.base.Repo(str(self.path), search_parent_directories=is_base)
-
+        repo = self._git_repo
         repo.remotes.origin.fetch()
         result = str(repo.git.reset("--hard", f"origin/{repo.active_branch.name}"))
         result += "\n" + str(repo.git.pull(force=True))
@@ -273,12 +349,17 @@ class Repository:
         if not file.is_file():
             return None
 
-        h = hashlib.sha256()
         with open(file, "rb") as handle:
-            chunk: bytes = b""
-            while chunk != b"":
-                # read 1kB at a time
-                chunk = handle.read(1024)
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(handle, "sha256").hexdigest()
+
+            # Python < 3.11
+            h = hashlib.sha256()
+            while True:
+                # read 256 kB at a time
+                chunk: bytes = handle.read(1 << 18)
+                if not chunk:
+                    break
                 h.update(chunk)
         file_hash = h.hexdigest()
         return file_hash
@@ -292,7 +373,8 @@ class Repository:
         if not requirements.is_file():
             return None
 
-        output: subprocess.CompletedProcess = subprocess.run(  # nosec: B603
+        # Both streams go through one pipe and are decoded as they are read
+        with subprocess.Popen(  # nosec: B603
             [
                 sys.executable,
                 "-m",
@@ -301,8 +383,11 @@ class Repository:
                 "-r",
                 requirements.resolve(),
             ],
-            capture_output=True,
-        )
-
-        result = output.stderr or output.stdout
-        return result.decode("utf-8")
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+        ) as process:
+            assert process.stdout is not None
+            lines: list[str] = list(process.stdout)
+
+        return "".join(lines)
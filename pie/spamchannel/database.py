@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import BigInteger, UniqueConstraint
+from sqlalchemy import BigInteger, UniqueConstraint, case, update
 from sqlalchemy.orm import mapped_column, Mapped
 
-from pie.database import session, Base
+from pie.database import session, Base, commit_or_defer
 
 
 class SpamChannel(Base):
@@ -25,7 +25,7 @@ class SpamChannel(Base):
     def add(guild_id: int, channel_id: int) -> SpamChannel:
         channel = SpamChannel(guild_id=guild_id, channel_id=channel_id)
         session.add(channel)
-        session.commit()
+        commit_or_defer()
         return channel
 
     @staticmethod
@@ -44,22 +44,30 @@ class SpamChannel(Base):
 
     @staticmethod
     def set_primary(guild_id: int, channel_id: int) -> SpamChannel | None:
-        query = (
-            session.query(SpamChannel)
-            .filter_by(guild_id=guild_id, primary=True)
-            .one_or_none()
+        """Set the channel as primary spam channel of the guild.
+
+        All other spam channels of the guild lose their primary status with the
+        same ``UPDATE`` statement.
+
+        :return: The new primary channel or ``None``, if the channel is not
+            a spam channel.
+        """
+        stmt = (
+            update(SpamChannel)
+            .where(SpamChannel.guild_id == guild_id)
+            .values(
+                primary=case((SpamChannel.channel_id == channel_id, True), else_=False)
+            )
+            .returning(SpamChannel)
         )
-        if query and query.channel_id == channel_id:
-            return query
-        if query:
-            query.primary = False
-
-        query = SpamChannel.get(guild_id, channel_id)
-        if query:
-            query.primary = True
-
-        session.commit()
-        return query
+        channels = session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).all()
+        commit_or_defer()
+        for channel in channels:
+            if channel.channel_id == channel_id:
+                return channel
+        return None
 
     @staticmethod
     def remove(guild_id: int, channel_id):
@@ -68,7 +76,7 @@ class SpamChannel(Base):
             .filter_by(guild_id=guild_id, channel_id=channel_id)
             .delete()
         )
-        session.commit()
+        commit_or_defer()
         return query
 
     def __repr__(self) -> str:
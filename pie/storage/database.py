@@ -5,7 +5,7 @@ from typing import Any, cast
 from sqlalchemy import BigInteger, CursorResult, delete
 from sqlalchemy.orm import mapped_column, Mapped
 
-from pie.database import session, Base
+from pie.database import session, Base, commit_or_defer, dialect_insert
 
 
 class StorageData(Base):
@@ -25,37 +25,35 @@ class StorageData(Base):
         value,
         allow_overwrite: bool = True,
     ) -> StorageData | None:
-        data = (
-            session.query(StorageData)
-            .filter_by(module=module)
-            .filter_by(guild_id=guild_id)
-            .filter_by(key=key)
-            .one_or_none()
+        stmt = dialect_insert(StorageData).values(
+            module=module,
+            guild_id=guild_id,
+            key=key,
+            value=value,
+            type=type(value).__name__,
         )
-
-        if data and not allow_overwrite:
-            return None
-
-        if not data:
-            data = StorageData(module=module, key=key, guild_id=guild_id)
-
-        data.value = value
-        data.type = type(value).__name__
-        session.merge(data)
-        session.commit()
+        if allow_overwrite:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["module", "guild_id", "key"],
+                set_={"value": stmt.excluded.value, "type": stmt.excluded.type},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=["module", "guild_id", "key"]
+            )
+
+        # Nothing is returned if the value exists and can't be overwritten
+        data = session.scalars(
+            stmt.returning(StorageData),
+            execution_options={"populate_existing": True},
+        ).one_or_none()
+        commit_or_defer()
 
         return data
 
     @staticmethod
     def get(module: str, guild_id: int, key: str) -> StorageData | None:
-        data = (
-            session.query(StorageData)
-            .filter_by(module=module)
-            .filter_by(guild_id=guild_id)
-            .filter_by(key=key)
-            .one_or_none()
-        )
-        return data
+        return session.get(StorageData, (module, guild_id, key))
 
     @staticmethod
     def remove(module: str, guild_id: int, key: str) -> bool:
@@ -65,7 +63,7 @@ class StorageData(Base):
             .where(StorageData.guild_id == guild_id)
             .where(StorageData.key == key)
         )
-        session.commit()
+        commit_or_defer()
 
         return cast(CursorResult, result).rowcount == 1
 
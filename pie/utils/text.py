@@ -1,7 +1,11 @@
 from collections.abc import Iterable
+from operator import attrgetter
 
 import discord
 
+# Characters that can start markdown escaped by discord.utils.escape_markdown()
+_MARKDOWN_CHARS = frozenset("*_~`|\\>[#-")
+
 
 def sanitise(
     string: str, *, limit: int = 2000, escape: bool = True, tag_escape=True
@@ -16,13 +20,16 @@ def sanitise(
     Returns:
         Sanitised string.
     """
-    if escape:
+    if escape and not _MARKDOWN_CHARS.isdisjoint(string):
         string = discord.utils.escape_markdown(string)
 
+    # Replacing only makes the text longer, so the part after the limit
+    # would be cut off anyway
+    string = string[:limit]
     if tag_escape:
         return string.replace("@", "@\u200b")[:limit]
     else:
-        return string[:limit]
+        return string
 
 
 def split(string: str, limit: int = 1990) -> list[str]:
@@ -33,7 +40,10 @@ def split(string: str, limit: int = 1990) -> list[str]:
     :return: A string split into a list of smaller lines with maximal length of
         ``limit``.
     """
-    return [string[0 + i : limit + i] for i in range(0, len(string), limit)]
+    if len(string) <= limit:
+        # Most messages fit, don't build the list through a comprehension
+        return [string] if string else []
+    return [string[i : i + limit] for i in range(0, len(string), limit)]
 
 
 def split_lines(lines: list[str], limit: int = 1990) -> list[str]:
@@ -48,17 +58,25 @@ def split_lines(lines: list[str], limit: int = 1990) -> list[str]:
     the :meth:`split()` on ``lines`` joined with newline character.
     """
     pages: list[str] = []
-    page: str = ""
+    page: list[str] = []
+    # length of the page, including the newline after each line
+    size: int = 0
 
     for line in lines:
-        if len(page) >= limit:
-            pages.append(page.strip("\n"))
-            page = ""
-        page += line + "\n"
-    pages.append(page.strip("\n"))
+        if size >= limit:
+            pages.append("\n".join(page).strip("\n"))
+            page = []
+            size = 0
+        page.append(line)
+        size += len(line) + 1
+    pages.append("\n".join(page).strip("\n"))
     return pages
 
 
+_TRUE = frozenset(("1", "true", "yes"))
+_FALSE = frozenset(("0", "false", "no"))
+
+
 def parse_bool(string: str) -> bool | None:
     """Parse string into a boolean.
 
@@ -71,9 +89,10 @@ def parse_bool(string: str) -> bool | None:
 
     Other keywords return ``None``.
     """
-    if string.lower() in ("1", "true", "yes"):
+    string = string.lower()
+    if string in _TRUE:
         return True
-    if string.lower() in ("0", "false", "no"):
+    if string in _FALSE:
         return False
     return None
 
@@ -98,22 +117,26 @@ def create_table(
             Defaults to ``False`` until Discord properly supports ANSI
             escape codes on Android.
     """
-    matrix: list[list[str]] = []
     pages: list[str] = []
 
-    # Compute column widths, make sure all fields have non-None values
-    matrix.append(list(header.values()))
-    column_widths: list[int] = [len(v) for v in header.values()]
+    # Make sure all fields have non-None values
+    attrs: list[str] = list(header.keys())
+    matrix: list[tuple[str, ...]] = [tuple(header.values())]
+    # Items usually have all the attributes, so they are read at once
+    getter = attrgetter(*attrs) if attrs else None
     for item in iterable:
-        line: list[str] = []
-        for i, attr in enumerate(header.keys()):
-            line.append(str(getattr(item, attr, "")))
-
-            item_width: int = len(line[i])
-            if column_widths[i] < item_width:
-                column_widths[i] = item_width
-
-        matrix.append(line)
+        try:
+            values = getter(item) if getter is not None else ()
+            if len(attrs) == 1:
+                values = (values,)
+        except AttributeError:
+            values = tuple(getattr(item, attr, "") for attr in attrs)
+        matrix.append(tuple(map(str, values)))
+
+    # Compute column widths
+    column_widths: list[int] = [
+        max(map(len, column)) for column in zip(*matrix, strict=True)
+    ]
 
     P: str = ""
     H: str = ""
@@ -125,34 +148,43 @@ def create_table(
         A = "\u001b[36m"  # cyan
         R = "\u001b[0m"  # reset
 
-    page: str = P
+    # Columns are separated by two spaces
+    cell_widths: list[int] = [width + 2 for width in column_widths]
+
+    # Pages are collected as lists of lines and joined when they are full
+    page: list[str] = [P]
+    page_size: int = len(P)
     for i, matrix_line in enumerate(matrix):
-        mline: str = ""
+        cells: list[str] = []
 
         # Color heading & odd lines
         if i == 0:
-            mline += H
+            cells.append(H)
         elif i % 2 == 0:
-            mline += A
+            cells.append(A)
 
         # Add values
-        for column_no, column_width in enumerate(column_widths):
-            mline += matrix_line[column_no].ljust(column_width + 2)
+        cells.extend(
+            f"{cell:<{width}}"
+            for cell, width in zip(matrix_line, cell_widths, strict=True)
+        )
 
         # End line
-        mline = mline.rstrip()
+        mline: str = "".join(cells).rstrip()
         if i % 2 == 0:
             mline += R + "\n"
         else:
             mline += "\n"
 
         # Add line
-        if len(page) + len(mline) > limit:
-            pages.append(page)
-            page = P
-        page += mline
+        if page_size + len(mline) > limit:
+            pages.append("".join(page))
+            page = [P]
+            page_size = len(P)
+        page.append(mline)
+        page_size += len(mline)
 
     # Add final non-complete page
-    pages.append(page)
+    pages.append("".join(page))
 
     return pages
@@ -131,6 +131,8 @@ bot = commands.Bot(
     help_command=Help(),
     intents=intents,
 )
+# Commit database changes deferred by the commands
+bot.after_invoke(database.flush_after_invoke)
 # This is required to make the 'bot' object hashable by ring's LRU cache
 # See pie/acl/__init__.py:map_member_to_ACLevel()
 bot.__ring_key__ = lambda: "bot"
@@ -257,8 +259,14 @@ async def load_modules():
 
 
 async def main():
-    await load_modules()
-    await bot.start(os.getenv("TOKEN"))
+    try:
+        # Modules may set up their data when loaded, commit it all at once
+        with database.bulk():
+            await load_modules()
+        await bot.start(os.getenv("TOKEN"))
+    finally:
+        # Commit database changes deferred by the modules
+        database.flush_now()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
+import configparser
 import git
+import hashlib
 import pytest
 import tempfile
 from pathlib import Path
 
 from pie.exceptions import RepositoryMetadataError
-from pie.repository import Repository
+from pie.repository import Repository, _read_conf
 
 
 def _create_repo(path: str):
@@ -152,3 +154,82 @@ def test_module_check_failures():
     )
 
     tempdir.cleanup()
+
+
+def test_requirements_txt_hash():
+    tempdir = tempfile.TemporaryDirectory()
+    _create_repo(tempdir.name)
+    temppath = Path(tempdir.name)
+    _update_init(tempdir.name)
+
+    try:
+        repository = Repository(temppath)
+        assert repository.requirements_txt_hash is None
+
+        _update_requirements(temppath, lines=["requests>=2.0", "# comment", ""])
+        content: bytes = (temppath / "requirements.txt").read_bytes()
+        assert repository.requirements_txt_hash == hashlib.sha256(content).hexdigest()
+    finally:
+        tempdir.cleanup()
+
+
+def test_git_repo__base_repository():
+    tempdir = tempfile.TemporaryDirectory()
+    git.repo.base.Repo.init(path=tempdir.name)
+    path = Path(tempdir.name) / "base"
+    path.mkdir()
+
+    try:
+        _update_init(path, name="test")
+        repository = Repository(path)
+        with pytest.raises(git.exc.InvalidGitRepositoryError):
+            _ = repository._git_repo
+
+        _update_init(path, name="base")
+        repository.set_facts()
+        assert repository._git_repo.working_tree_dir == tempdir.name
+    finally:
+        tempdir.cleanup()
+
+
+def test_read_conf__base_repository():
+    path = Path(__file__).parents[3] / "modules" / "base" / "repo.conf"
+    text = path.read_text(encoding="utf-8")
+
+    config = configparser.ConfigParser()
+    config.read_string(text)
+
+    options = _read_conf(text, "repository")
+    assert options == dict(config["repository"])
+    assert options["name"] == "base"
+    assert "acl" in options["modules"].split()
+
+
+def test_read_conf__multiline():
+    text = "[repository]\nname = test\nmodules =\n\ttest_a\n    test_b\nother = 1\n"
+
+    options = _read_conf(text, "repository")
+    assert options == {"name": "test", "modules": "\ntest_a\ntest_b", "other": "1"}
+
+
+def test_read_conf__comments():
+    text = (
+        "# comment\n"
+        "[repository]\n"
+        "; comment\n"
+        "name: test\n"
+        "modules = test_a\n"
+        "    # comment\n"
+        "    test_b\n"
+    )
+
+    options = _read_conf(text, "repository")
+    assert options == {"name": "test", "modules": "test_a\ntest_b"}
+
+
+def test_read_conf__sections():
+    text = "[other]\nname = other\n[repository]\nname = test\n[last]\nname = last\n"
+
+    assert _read_conf(text, "repository") == {"name": "test"}
+    assert _read_conf(text, "missing") == {}
+    assert _read_conf("name = test\n", "repository") == {}
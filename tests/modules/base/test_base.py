@@ -0,0 +1,74 @@
+import pytest
+
+from modules.base.base.database import AutoThread, Bookmark, UserPin, UserThread
+
+GUILD_ID: int = 7101
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    yield
+    for model in (AutoThread, Bookmark, UserPin, UserThread):
+        model.remove_by_guild(GUILD_ID)
+
+
+def test_add__update_existing():
+    first = UserPin.add(GUILD_ID, 2, 1)
+    second = UserPin.add(GUILD_ID, 2, 5)
+
+    assert second.idx == first.idx
+    assert second.limit == 5
+    assert [tuple(row) for row in UserPin.get_all_rows(GUILD_ID)] == [(GUILD_ID, 2, 5)]
+
+
+def test_add__guild_wide():
+    Bookmark.add(GUILD_ID, None, False)
+    Bookmark.add(GUILD_ID, 2, False)
+    Bookmark.add(GUILD_ID, None, True)
+
+    assert getattr(Bookmark.get(GUILD_ID, None), "enabled", None) is True
+    assert getattr(Bookmark.get(GUILD_ID, 2), "enabled", None) is False
+    assert {tuple(row) for row in Bookmark.get_all_rows(GUILD_ID)} == {
+        (GUILD_ID, None, True),
+        (GUILD_ID, 2, False),
+    }
+
+
+def test_get_all_rows():
+    UserThread.add(GUILD_ID, None, 1)
+    UserThread.add(GUILD_ID, 2, 3)
+    AutoThread.add(GUILD_ID, 4, 60)
+    AutoThread.add(GUILD_ID, 4, 1440)
+
+    rows = sorted(UserThread.get_all_rows(GUILD_ID), key=lambda row: row.limit)
+    assert [(row.guild_id, row.channel_id, row.limit) for row in rows] == [
+        (GUILD_ID, None, 1),
+        (GUILD_ID, 2, 3),
+    ]
+    rows = AutoThread.get_all_rows(GUILD_ID)
+    assert [(row.guild_id, row.channel_id, row.duration) for row in rows] == [
+        (GUILD_ID, 4, 1440)
+    ]
+
+
+def test_remove_many():
+    UserPin.add(GUILD_ID, None, 1)
+    UserPin.add(GUILD_ID, 2, 1)
+    UserPin.add(GUILD_ID, 3, 1)
+
+    assert UserPin.remove_many([(GUILD_ID, None), (GUILD_ID, 2), (GUILD_ID, 9)]) == 2
+    assert [row.channel_id for row in UserPin.get_all_rows(GUILD_ID)] == [3]
+    assert UserPin.remove_many([]) == 0
+
+
+def test_remove_by_guild():
+    UserThread.add(GUILD_ID, None, 1)
+    UserThread.add(GUILD_ID, 2, 1)
+    UserThread.add(GUILD_ID + 1, 2, 1)
+
+    try:
+        assert UserThread.remove_by_guild(GUILD_ID) == 2
+        assert UserThread.get_all_rows(GUILD_ID) == []
+        assert len(UserThread.get_all_rows(GUILD_ID + 1)) == 1
+    finally:
+        UserThread.remove_by_guild(GUILD_ID + 1)
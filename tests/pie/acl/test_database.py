@@ -0,0 +1,57 @@
+from pie.acl.database import (
+    ACDefault,
+    ACDefaultView,
+    ACLevel,
+    ACLevelMappingView,
+    ACLevelMappping,
+    ChannelOverwrite,
+    ChannelOverwriteView,
+    RoleOverwrite,
+    RoleOverwriteView,
+    UserOverwrite,
+    UserOverwriteView,
+)
+from pie.acl.snapshot import ACLSnapshot
+
+GUILD_ID: int = 7301
+
+
+def test_get_all_rows():
+    ACDefault.add(GUILD_ID, "cmd", ACLevel.MOD)
+    RoleOverwrite.add(GUILD_ID, 10, "cmd", True)
+    UserOverwrite.add(GUILD_ID, 20, "cmd", False)
+    ChannelOverwrite.add(GUILD_ID, 30, "cmd", True)
+    ACLevelMappping.add(GUILD_ID, 10, ACLevel.SUBMOD)
+
+    try:
+        assert ACDefault.get_all_rows(GUILD_ID) == [
+            ACDefaultView(GUILD_ID, "cmd", ACLevel.MOD)
+        ]
+        assert RoleOverwrite.get_all_rows(GUILD_ID) == [
+            RoleOverwriteView(GUILD_ID, 10, "cmd", True)
+        ]
+        assert UserOverwrite.get_all_rows(GUILD_ID) == [
+            UserOverwriteView(GUILD_ID, 20, "cmd", False)
+        ]
+        assert ChannelOverwrite.get_all_rows(GUILD_ID) == [
+            ChannelOverwriteView(GUILD_ID, 30, "cmd", True)
+        ]
+        assert ACLevelMappping.get_all_rows(GUILD_ID) == [
+            ACLevelMappingView(GUILD_ID, 10, ACLevel.SUBMOD)
+        ]
+
+        snapshot = ACLSnapshot.load(GUILD_ID)
+        assert snapshot.defaults == {"cmd": ACLevel.MOD}
+        assert snapshot.role_over == {(10, "cmd"): True}
+        assert snapshot.user_over == {(20, "cmd"): False}
+        assert snapshot.channel_over == {(30, "cmd"): True}
+        assert snapshot.level_map == {10: ACLevel.SUBMOD}
+    finally:
+        ACDefault.remove(GUILD_ID, "cmd")
+        RoleOverwrite.remove(GUILD_ID, 10, "cmd")
+        UserOverwrite.remove(GUILD_ID, 20, "cmd")
+        ChannelOverwrite.remove(GUILD_ID, 30, "cmd")
+        ACLevelMappping.remove(GUILD_ID, 10)
+
+    assert ACDefault.get_all_rows(GUILD_ID) == []
+    assert ACLSnapshot.load(GUILD_ID).defaults == {}
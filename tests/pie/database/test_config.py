@@ -0,0 +1,22 @@
+from sqlalchemy import func, select, update
+
+from pie.database import config, session
+from pie.database.config import Config
+
+
+def test_config_get__other_idx():
+    """Configuration created by older versions may have any primary key."""
+    cached = Config.get()
+    original: int = session.scalars(select(Config.idx)).one()
+    session.execute(update(Config).values(idx=5))
+    session.commit()
+    config._cached = None
+
+    try:
+        loaded = Config.get()
+        assert loaded.idx == 5
+        assert session.scalar(select(func.count()).select_from(Config)) == 1
+    finally:
+        session.execute(update(Config).values(idx=original))
+        session.commit()
+        config._cached = cached
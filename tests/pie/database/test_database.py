@@ -0,0 +1,39 @@
+import asyncio
+
+from sqlalchemy import select
+
+from pie import database
+from pie.acl.database import ACDefault, ACLevel
+
+GUILD_ID: int = 7001
+
+
+def _committed_commands() -> list[str]:
+    """Read the default levels through other connection, which only sees commits."""
+    with database.database.db.connect() as connection:
+        return list(
+            connection.scalars(
+                select(ACDefault.command).where(ACDefault.guild_id == GUILD_ID)
+            )
+        )
+
+
+def test_flush_after_invoke():
+    try:
+        ACDefault.add(GUILD_ID, "deferred", ACLevel.MOD, commit=False)
+        assert _committed_commands() == []
+
+        asyncio.run(database.flush_after_invoke(None))
+        assert _committed_commands() == ["deferred"]
+    finally:
+        ACDefault.remove(GUILD_ID, "deferred")
+
+
+def test_flush_after_invoke__nothing_deferred():
+    ACDefault.add(GUILD_ID, "direct", ACLevel.MOD)
+    try:
+        assert _committed_commands() == ["direct"]
+        asyncio.run(database.flush_after_invoke(None))
+        assert _committed_commands() == ["direct"]
+    finally:
+        ACDefault.remove(GUILD_ID, "direct")
@@ -0,0 +1,252 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Engine,
+    Integer,
+    MetaData,
+    SmallInteger,
+    String,
+    Table,
+    UniqueConstraint,
+    create_engine,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+
+from pie.acl.database import ACLevel
+from pie.database import migrations
+from pie.exceptions import DatabaseUpgradeError
+
+
+def _create_engine(path: str) -> Engine:
+    return create_engine(f"sqlite:///{Path(path) / 'test.db'}")
+
+
+def _pin_table(metadata: MetaData, *, unique: bool, name: str = "base_base_userpin"):
+    """Create table like the one of UserPin, with or without the constraint."""
+    args: list = [
+        Column("idx", Integer, primary_key=True, autoincrement=True),
+        Column("guild_id", BigInteger),
+        Column("channel_id", BigInteger, nullable=True),
+    ]
+    if unique:
+        args.append(UniqueConstraint("guild_id", "channel_id"))
+    return Table(name, metadata, *args)
+
+
+def _seed_duplicates(engine: Engine, *, name: str = "base_base_userpin") -> None:
+    """Create the table without the constraint and fill it with duplicates."""
+    old = MetaData()
+    table = _pin_table(old, unique=False, name=name)
+    old.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            table.insert(),
+            [
+                {"idx": 1, "guild_id": 1, "channel_id": 2},
+                {"idx": 2, "guild_id": 1, "channel_id": 2},
+                {"idx": 3, "guild_id": 1, "channel_id": None},
+                {"idx": 4, "guild_id": 1, "channel_id": None},
+                {"idx": 5, "guild_id": 1, "channel_id": 3},
+            ],
+        )
+
+
+def _indexes(engine: Engine, name: str) -> list[str | None]:
+    return [index["name"] for index in inspect(engine).get_indexes(name)]
+
+
+def _idx(engine: Engine, table: Table) -> list[int]:
+    with engine.connect() as connection:
+        return list(connection.scalars(select(table.c.idx).order_by(table.c.idx)))
+
+
+def test_add_unique_constraints__duplicates_abort():
+    tempdir = tempfile.TemporaryDirectory()
+    engine = _create_engine(tempdir.name)
+    _seed_duplicates(engine)
+
+    metadata = MetaData()
+    table = _pin_table(metadata, unique=True)
+
+    try:
+        with pytest.raises(DatabaseUpgradeError) as excinfo:
+            with engine.begin() as connection:
+                migrations.add_unique_constraints(connection, metadata)
+        assert "has 2 duplicate rows" in str(excinfo.value)
+        assert _idx(engine, table) == [1, 2, 3, 4, 5]
+        assert _indexes(engine, table.name) == []
+    finally:
+        engine.dispose()
+        tempdir.cleanup()
+
+
+def test_add_unique_constraints__remove_duplicates():
+    tempdir = tempfile.TemporaryDirectory()
+    engine = _create_engine(tempdir.name)
+    _seed_duplicates(engine)
+
+    metadata = MetaData()
+    table = _pin_table(metadata, unique=True)
+
+    try:
+        with engine.begin() as connection:
+            migrations.add_unique_constraints(
+                connection, metadata, remove_duplicates=True
+            )
+        # The newest row of each group survives, including the NULL channel
+        assert _idx(engine, table) == [2, 4, 5]
+        assert _indexes(engine, table.name) == [
+            "uq_base_base_userpin_guild_id_channel_id"
+        ]
+
+        # Running it again changes nothing
+        with engine.begin() as connection:
+            migrations.add_unique_constraints(
+                connection, metadata, remove_duplicates=True
+            )
+        assert _idx(engine, table) == [2, 4, 5]
+        assert len(_indexes(engine, table.name)) == 1
+    finally:
+        engine.dispose()
+        tempdir.cleanup()
+
+
+def test_add_unique_constraints__other_tables():
+    tempdir = tempfile.TemporaryDirectory()
+    engine = _create_engine(tempdir.name)
+    _seed_duplicates(engine, name="other_module_table")
+
+    metadata = MetaData()
+    table = _pin_table(metadata, unique=True, name="other_module_table")
+
+    try:
+        with engine.begin() as connection:
+            migrations.add_unique_constraints(
+                connection, metadata, remove_duplicates=True
+            )
+        assert _idx(engine, table) == [1, 2, 3, 4, 5]
+        assert _indexes(engine, table.name) == []
+    finally:
+        engine.dispose()
+        tempdir.cleanup()
+
+
+def test_upgrade__remove_duplicates_env(monkeypatch):
+    tempdir = tempfile.TemporaryDirectory()
+    engine = _create_engine(tempdir.name)
+    _seed_duplicates(engine)
+
+    metadata = MetaData()
+    table = _pin_table(metadata, unique=True)
+
+    try:
+        monkeypatch.delenv("DB_REMOVE_DUPLICATES", raising=False)
+        with pytest.raises(DatabaseUpgradeError):
+            migrations.upgrade(engine, metadata)
+
+        monkeypatch.setenv("DB_REMOVE_DUPLICATES", "1")
+        migrations.upgrade(engine, metadata)
+        assert _idx(engine, table) == [2, 4, 5]
+    finally:
+        engine.dispose()
+        tempdir.cleanup()
+
+
+def _acdefault_table(metadata: MetaData, *, level) -> Table:
+    """Create table like the one of ACDefault, with the given level column."""
+    return Table(
+        "pie_acl_acdefault",
+        metadata,
+        Column("idx", Integer, primary_key=True, autoincrement=True),
+        Column("guild_id", BigInteger),
+        Column("command", String),
+        level,
+        UniqueConstraint("guild_id", "command"),
+    )
+
+
+def _schema(engine: Engine) -> list[str]:
+    with engine.connect() as connection:
+        return list(
+            connection.scalars(
+                text("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY name")
+            )
+        )
+
+
+def test_convert_enum_names():
+    tempdir = tempfile.TemporaryDirectory()
+    engine = _create_engine(tempdir.name)
+
+    # Older versions stored the levels as sqlalchemy.Enum, which uses names
+    old = MetaData()
+    old_table = Table(
+        "pie_acl_acdefault",
+        old,
+        Column("idx", Integer, primary_key=True, autoincrement=True),
+        Column("guild_id", BigInteger),
+        Column("command", String),
+        Column("level", String(11)),
+    )
+    old.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            old_table.insert(),
+            [
+                {"idx": 1, "guild_id": 1, "command": "a", "level": "MOD"},
+                {"idx": 2, "guild_id": 1, "command": "b", "level": "EVERYONE"},
+                {"idx": 3, "guild_id": 2, "command": "a", "level": "BOT_OWNER"},
+            ],
+        )
+
+    metadata = MetaData()
+    table = _acdefault_table(
+        metadata, level=Column("level", SmallInteger, info={"enum": ACLevel})
+    )
+
+    try:
+        migrations.upgrade(engine, metadata)
+
+        columns = {c["name"]: c["type"] for c in inspect(engine).get_columns(table.name)}
+        assert isinstance(columns["level"], Integer)
+        with engine.connect() as connection:
+            rows = connection.execute(select(table).order_by(table.c.idx)).all()
+        assert [tuple(row) for row in rows] == [
+            (1, 1, "a", ACLevel.MOD.value),
+            (2, 1, "b", ACLevel.EVERYONE.value),
+            (3, 2, "a", ACLevel.BOT_OWNER.value),
+        ]
+
+        # Running it again changes nothing
+        schema = _schema(engine)
+        migrations.upgrade(engine, metadata)
+        assert _schema(engine) == schema
+        with engine.connect() as connection:
+            assert connection.execute(select(table).order_by(table.c.idx)).all() == rows
+    finally:
+        engine.dispose()
+        tempdir.cleanup()
+
+
+def test_convert_enum_names__postgresql():
+    metadata = MetaData()
+    table = _acdefault_table(
+        metadata, level=Column("level", SmallInteger, info={"enum": ACLevel})
+    )
+
+    statements = migrations._alter_statements(
+        postgresql.dialect(), table, {"level": ACLevel}
+    )
+    assert statements == [
+        "ALTER TABLE pie_acl_acdefault ALTER COLUMN level TYPE SMALLINT USING "
+        "CASE CAST(level AS VARCHAR) WHEN 'BOT_OWNER' THEN 5 WHEN 'GUILD_OWNER' THEN 4 "
+        "WHEN 'MOD' THEN 3 WHEN 'SUBMOD' THEN 2 WHEN 'MEMBER' THEN 1 "
+        "WHEN 'EVERYONE' THEN 0 END"
+    ]
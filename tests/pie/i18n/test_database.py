@@ -0,0 +1,31 @@
+from pie.i18n.database import GuildLanguage, MemberLanguage
+
+GUILD_ID: int = 7201
+
+
+def test_guild_language_add__update_existing():
+    try:
+        first = GuildLanguage.add(GUILD_ID, "cs")
+        second = GuildLanguage.add(GUILD_ID, "sk")
+
+        assert second.idx == first.idx
+        assert getattr(GuildLanguage.get(GUILD_ID), "language", None) == "sk"
+        assert GuildLanguage.get_language(GUILD_ID) == "sk"
+    finally:
+        GuildLanguage.remove(GUILD_ID)
+    assert GuildLanguage.get_language(GUILD_ID) is None
+
+
+def test_member_language_add__update_existing():
+    try:
+        first = MemberLanguage.add(GUILD_ID, 2, "cs")
+        second = MemberLanguage.add(GUILD_ID, 2, "sk")
+        MemberLanguage.add(GUILD_ID, 3, "en")
+
+        assert second.idx == first.idx
+        assert MemberLanguage.get_language(GUILD_ID, 2) == "sk"
+        assert MemberLanguage.get_language(GUILD_ID, 3) == "en"
+    finally:
+        MemberLanguage.remove(GUILD_ID, 2)
+        MemberLanguage.remove(GUILD_ID, 3)
+    assert MemberLanguage.get_language(GUILD_ID, 2) is None
@@ -4,11 +4,15 @@ from pie import utils
 def test_text_sanitise():
     assert "a\\*b" == utils.text.sanitise("a*b")
     assert "a\\_b" == utils.text.sanitise("a_b")
+    assert "\\# a" == utils.text.sanitise("# a")
+    assert "a b" == utils.text.sanitise("a b")
 
 
 def test_text_split():
     assert ["abc", "def"] == utils.text.split("abcdef", limit=3)
     assert ["abcd", "efgh"] == utils.text.split("abcdefgh", limit=4)
+    assert ["abc"] == utils.text.split("abc", limit=3)
+    assert [] == utils.text.split("", limit=3)
 
 
 def test_text_split_lines():